@@ -18,7 +18,10 @@ class DatabaseHelper {
   // v4: 今日食谱 & 用量自定义表
   // v5: 升级时导入 assets/recipes/seed_more.json（去重导入）
   // v6: today_custom_qty 增加 owned 列；提供 setTodayIngredientOwned；汇总返回 owned
-  static const _dbVersion = 6;
+  // v7: recipes 加 image_source、image_resolved_at；为已有种子菜谱回填构建期预解析的图片地址
+  // 种子改为打包 seed_pack.json（做法去重版，结构见 scripts/recipe_pipeline/seed.py）
+  static const _seedAsset = 'assets/recipes/seed_pack.json';
+  static const _dbVersion = 7;
 
   Database? _db;
 
@@ -47,7 +50,9 @@ class DatabaseHelper {
         cuisine TEXT NOT NULL,
         is_custom INTEGER NOT NULL DEFAULT 0,
         image_url TEXT,
-        instructions TEXT
+        instructions TEXT,
+        image_source TEXT,
+        image_resolved_at TEXT
       );
     ''');
 
@@ -84,7 +89,7 @@ class DatabaseHelper {
 
     await _seed(db);
     // 新装：导入更多种子
-    await _importFromAssetIfAny(db, 'assets/recipes/seed_more.json');
+    await _importFromAssetIfAny(db, _seedAsset);
   }
 
   Future<void> _onUpgrade(Database db, int oldVersion, int newVersion) async {
@@ -115,9 +120,17 @@ class DatabaseHelper {
         );
       ''');
     }
+    // v7 的图片来源列要先加：v5 的导入会写这两列（已存在会抛错，忽略）
+    if (oldVersion < 7) {
+      for (final col in ['image_source', 'image_resolved_at']) {
+        try {
+          await db.execute('ALTER TABLE recipes ADD COLUMN $col TEXT;');
+        } catch (_) {}
+      }
+    }
     // v5：升级时也导入一次最新 seeds（安全去重，不覆盖已存在）
     if (oldVersion < 5) {
-      await _importFromAssetIfAny(db, 'assets/recipes/seed_more.json');
+      await _importFromAssetIfAny(db, _seedAsset);
     }
     // v6：补 owned 列（如果已存在会抛错，这里忽略即可）
     if (oldVersion < 6) {
@@ -125,6 +138,10 @@ class DatabaseHelper {
         await db.execute('ALTER TABLE today_custom_qty ADD COLUMN owned INTEGER NOT NULL DEFAULT 0;');
       } catch (_) {}
     }
+    // v7：v5 只导入新菜，已装用户的种子菜谱在这里补上构建期预解析的图片地址
+    if (oldVersion < 7) {
+      await _backfillSeedImages(db, _seedAsset);
+    }
   }
 
   // ============== 初始种子（简化示例） ==============
@@ -205,13 +222,27 @@ class DatabaseHelper {
 4) 出锅装盘，即成《$name》。
 ''';
 
-  // ========== 从 assets 导入更多菜谱（JSON 数组） ==========
+  // ========== 从 assets 导入更多菜谱 ==========
+  // 支持两种格式：JSON 数组（seed_more.json），或做法去重的 pack（seed_pack.json）：
+  //   {"instructions": [正文...], "recipes": [{..., "instructions_id": i, "instructions_arg": "主料"}]}
+  Future<List> _loadSeedItems(String assetPath) async {
+    final text = await rootBundle.loadString(assetPath);
+    final data = json.decode(text);
+    if (data is List) return data;
+    if (data is Map && data['recipes'] is List) {
+      final bodies = (data['instructions'] as List? ?? const []).cast<String>();
+      return [
+        for (final r in data['recipes'] as List)
+          {...(r as Map), 'instructions': _expandInstructions(bodies, r)},
+      ];
+    }
+    return const [];
+  }
+
   Future<void> _importFromAssetIfAny(Database db, String assetPath) async {
     try {
-      final text = await rootBundle.loadString(assetPath);
-      final data = json.decode(text);
-      if (data is! List) return;
-      for (final item in data) {
+      final items = await _loadSeedItems(assetPath);
+      for (final item in items) {
         final name = (item['name'] ?? '').toString().trim();
         if (name.isEmpty) continue;
         final cuisine = CuisineX.fromKey((item['cuisine'] ?? 'custom').toString());
@@ -228,6 +259,8 @@ class DatabaseHelper {
           'cuisine': cuisine.key,
           'is_custom': 0,
           'image_url': item['image_url'],
+          'image_source': item['image_source'],
+          'image_resolved_at': item['image_resolved_at'],
           'instructions': (item['instructions'] ?? _defaultSteps(name)).toString(),
         });
 
@@ -249,6 +282,40 @@ class DatabaseHelper {
     }
   }
 
+  // 只填图片为空的种子菜谱：用户从相册设的图、运行时已缓存的地址都不覆盖
+  Future<void> _backfillSeedImages(Database db, String assetPath) async {
+    try {
+      final items = await _loadSeedItems(assetPath);
+      final batch = db.batch();
+      for (final item in items) {
+        final url = (item['image_url'] ?? '').toString();
+        final name = (item['name'] ?? '').toString().trim();
+        if (url.isEmpty || name.isEmpty) continue;
+        final cuisine = CuisineX.fromKey((item['cuisine'] ?? 'custom').toString());
+        batch.update(
+          'recipes',
+          {
+            'image_url': url,
+            'image_source': item['image_source'],
+            'image_resolved_at': item['image_resolved_at'],
+          },
+          where: "name = ? AND cuisine = ? AND is_custom = 0 AND (image_url IS NULL OR image_url = '')",
+          whereArgs: [name, cuisine.key],
+        );
+      }
+      await batch.commit(noResult: true);
+    } catch (_) {
+      // asset 不存在或格式问题，忽略
+    }
+  }
+
+  static String? _expandInstructions(List<String> bodies, Map r) {
+    final id = r['instructions_id'];
+    if (id is! int || id < 0 || id >= bodies.length) return null;
+    final arg = r['instructions_arg'];
+    return arg is String ? bodies[id].replaceAll('{0}', arg) : bodies[id];
+  }
+
   // ================== CRUD：Recipe ==================
   Future<List<Recipe>> getRecipesByCuisine(Cuisine c) async {
     final d = await db;
@@ -257,6 +324,17 @@ class DatabaseHelper {
     return maps.map(Recipe.fromMap).toList();
   }
 
+  /// 按菜名 + 菜系 key 取一道菜（检索结果 RecipeSearchHit 用它对应回主库）
+  Future<Recipe?> getRecipeByName(String name, String cuisineKey) async {
+    final d = await db;
+    final maps = await d.query('recipes',
+        where: 'name = ? AND cuisine = ?',
+        whereArgs: [name, cuisineKey],
+        orderBy: 'id DESC',
+        limit: 1);
+    return maps.isEmpty ? null : Recipe.fromMap(maps.first);
+  }
+
   Future<List<Recipe>> getCustomRecipes() async {
     final d = await db;
     final maps =
@@ -2,6 +2,7 @@ import 'package:flutter/material.dart';
 import '../models/cuisine.dart';
 import 'recipe_list_page.dart';
 import 'recipe_edit_page.dart';
+import 'search_page.dart';
 import 'today_page.dart';
 
 class HomePage extends StatefulWidget {
@@ -19,6 +20,13 @@ class _HomePageState extends State<HomePage> {
       appBar: AppBar(
         title: const Text('不愁吃'),
         actions: [
+          IconButton(
+            tooltip: '搜索',
+            icon: const Icon(Icons.search),
+            onPressed: () {
+              Navigator.push(context, MaterialPageRoute(builder: (_) => const SearchPage()));
+            },
+          ),
           IconButton(
             tooltip: '今日食谱',
             icon: const Icon(Icons.today),
@@ -20,6 +20,7 @@ class RecipeInfoPage extends StatefulWidget {
 
 class _RecipeInfoPageState extends State<RecipeInfoPage> {
   String? _assetPath; // 本地 assets 映射
+  AssetImageInfo? _assetInfo; // 映射中的占位信息（主色/缩略图）
   String? _filePath;  // 私有目录文件
   String? _netUrl;    // 网络兜底
   final db = DatabaseHelper.instance;
@@ -34,8 +35,13 @@ class _RecipeInfoPageState extends State<RecipeInfoPage> {
     final r = widget.recipe;
 
     // 1) assets 映射
-    final a = await AssetImageResolver.instance.assetFor(r.name);
-    if (mounted) setState(() => _assetPath = a);
+    final a = await AssetImageResolver.instance.infoFor(r.name);
+    if (mounted) {
+      setState(() {
+        _assetInfo = a;
+        _assetPath = a?.path;
+      });
+    }
 
     // 2) DB 中的 image_url（可能是 file:// 或绝对路径或 http/https）
     final stored = await db.getRecipeImage(r.id!);
@@ -49,8 +55,9 @@ class _RecipeInfoPageState extends State<RecipeInfoPage> {
       }
     }
 
-    // 3) 若无本地 & 无网络缓存，则尝试旧逻辑的网络兜底（可选）
-    if (_assetPath == null && _filePath == null && _netUrl == null) {
+    // 3) 仅用户自建菜谱：若无本地 & 无网络缓存，则尝试旧逻辑的网络兜底（可选）
+    //    种子菜谱的 image_url 已由 scripts/prefetch_image_urls.py 在构建期解析好；为空说明构建期没查到，运行时不再重查
+    if (r.isCustom && _assetPath == null && _filePath == null && _netUrl == null) {
       final url = await db.resolveAndCacheImage(r.id!, r.name);
       if (mounted) setState(() => _netUrl = url);
     }
@@ -111,7 +118,19 @@ class _RecipeInfoPageState extends State<RecipeInfoPage> {
 
     Widget img;
     if (_assetPath != null) {
-      img = Image.asset(_assetPath!, fit: BoxFit.cover);
+      // 已知原图宽度时按屏幕像素宽度解码，避免解出 1600px 的整图
+      final screenPx = (MediaQuery.of(context).size.width *
+              MediaQuery.of(context).devicePixelRatio)
+          .round();
+      final srcW = _assetInfo?.width;
+      img = Image.asset(
+        _assetPath!,
+        fit: BoxFit.cover,
+        cacheWidth: (srcW != null && srcW > screenPx) ? screenPx : null,
+        // 原图解码完成前先显示预计算的主色/缩略图
+        frameBuilder: (_, child, frame, sync) =>
+            (sync || frame != null) ? child : _assetPlaceholder(),
+      );
     } else if (_filePath != null && File(_filePath!).existsSync()) {
       img = Image.file(File(_filePath!), fit: BoxFit.cover);
     } else if (_netUrl != null) {
@@ -192,6 +211,15 @@ class _RecipeInfoPageState extends State<RecipeInfoPage> {
     );
   }
 
+  Widget _assetPlaceholder() {
+    final info = _assetInfo;
+    if (info?.lqip != null) {
+      return Image.memory(info!.lqip!, fit: BoxFit.cover, gaplessPlayback: true,
+          filterQuality: FilterQuality.low);
+    }
+    return Container(color: info?.color ?? Colors.grey.shade200);
+  }
+
   Widget _placeholder() => Container(
         color: Colors.grey.shade200,
         alignment: Alignment.center,
@@ -0,0 +1,66 @@
+import 'package:flutter/material.dart';
+import '../db/database_helper.dart';
+import '../models/cuisine.dart';
+import '../services/recipe_search.dart';
+import 'recipe_info_page.dart';
+
+/// 按技法/食材搜菜（“豆瓣”“清蒸 鱼”），结果来自打包的 search.db
+class SearchPage extends StatefulWidget {
+  const SearchPage({super.key});
+  @override
+  State<SearchPage> createState() => _SearchPageState();
+}
+
+class _SearchPageState extends State<SearchPage> {
+  final db = DatabaseHelper.instance;
+  List<RecipeSearchHit> _hits = const [];
+  String _query = '';
+
+  Future<void> _search(String q) async {
+    _query = q;
+    final hits = await RecipeSearch.instance.search(q);
+    // 输入比查询快时只保留最后一次的结果
+    if (mounted && q == _query) setState(() => _hits = hits);
+  }
+
+  Future<void> _open(RecipeSearchHit h) async {
+    final r = await db.getRecipeByName(h.name, h.cuisine);
+    if (!mounted) return;
+    if (r == null) {
+      ScaffoldMessenger.of(context).showSnackBar(
+        SnackBar(content: Text('本地菜谱里没有 ${h.name}')),
+      );
+      return;
+    }
+    Navigator.push(context, MaterialPageRoute(builder: (_) => RecipeInfoPage(recipe: r)));
+  }
+
+  @override
+  Widget build(BuildContext context) {
+    return Scaffold(
+      appBar: AppBar(
+        title: TextField(
+          autofocus: true,
+          textInputAction: TextInputAction.search,
+          decoration: const InputDecoration(hintText: '搜菜名、食材或做法，如“豆瓣”', border: InputBorder.none),
+          onChanged: _search,
+          onSubmitted: _search,
+        ),
+      ),
+      body: _hits.isEmpty
+          ? Center(child: Text(_query.trim().isEmpty ? '输入关键词开始搜索' : '没有找到相关菜谱'))
+          : ListView.separated(
+              itemCount: _hits.length,
+              separatorBuilder: (_, __) => const Divider(height: 0),
+              itemBuilder: (_, i) {
+                final h = _hits[i];
+                return ListTile(
+                  title: Text(h.name),
+                  subtitle: Text(CuisineX.fromKey(h.cuisine).zh),
+                  onTap: () => _open(h),
+                );
+              },
+            ),
+    );
+  }
+}
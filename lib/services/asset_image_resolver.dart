@@ -1,25 +1,102 @@
 import 'dart:convert';
+import 'dart:typed_data';
+import 'package:flutter/painting.dart' show Color;
 import 'package:flutter/services.dart' show rootBundle;
 
+/// images.json 中单张图片的信息。
+/// 值可以是字符串（仅路径），也可以是对象：{path, width, height, aspect, bytes, sha1, color, lqip}
+class AssetImageInfo {
+  final String path;
+  final int? width;        // 预计算尺寸（只读文件头得到），布局前无需解码
+  final int? height;
+  final double? aspect;    // width / height
+  final Color? color;      // 预计算主色，可直接铺底
+  final Uint8List? lqip;   // 极小缩略图（已解出 data URI 的字节）
+
+  const AssetImageInfo(this.path,
+      {this.width, this.height, this.aspect, this.color, this.lqip});
+
+  static AssetImageInfo? fromJson(dynamic v) {
+    if (v is String) return v.isEmpty ? null : AssetImageInfo(v);
+    if (v is! Map) return null;
+    final path = (v['path'] ?? '').toString();
+    if (path.isEmpty) return null;
+    return AssetImageInfo(
+      path,
+      width: (v['width'] as num?)?.toInt(),
+      height: (v['height'] as num?)?.toInt(),
+      aspect: (v['aspect'] as num?)?.toDouble(),
+      color: _parseColor(v['color']),
+      lqip: _parseDataUri(v['lqip']),
+    );
+  }
+
+  static Color? _parseColor(dynamic v) {
+    if (v is! String || !v.startsWith('#') || v.length != 7) return null;
+    final rgb = int.tryParse(v.substring(1), radix: 16);
+    return rgb == null ? null : Color(0xFF000000 | rgb);
+  }
+
+  static Uint8List? _parseDataUri(dynamic v) {
+    if (v is! String || !v.startsWith('data:')) return null;
+    try {
+      return UriData.parse(v).contentAsBytes();
+    } catch (_) {
+      return null;
+    }
+  }
+}
+
 class AssetImageResolver {
   AssetImageResolver._();
   static final AssetImageResolver instance = AssetImageResolver._();
 
-  Map<String, String>? _map; // name -> asset path
+  Map<String, AssetImageInfo>? _map; // name -> asset info
 
   Future<void> _ensureLoaded() async {
     if (_map != null) return;
+    // 先在局部变量里建好完整映射（含别名覆盖）再一次性赋值：
+    // 否则并发调用会看到尚未覆盖别名的 _map，查不到就去走网络
+    final map = <String, AssetImageInfo>{};
     try {
       final text = await rootBundle.loadString('assets/recipes/images.json');
-      final data = json.decode(text);
-      _map = { for (final e in (data as Map).entries) e.key.toString() : e.value.toString() };
+      final data = json.decode(text) as Map;
+      for (final e in data.entries) {
+        final info = AssetImageInfo.fromJson(e.value);
+        if (info != null) map[e.key.toString()] = info;
+      }
+    } catch (_) {
+      map.clear();
+    }
+    await _overlayResolution(map);
+    _map ??= map;
+  }
+
+  /// image_resolution.json：构建期预解析的别名/归一化/模糊匹配（见 scripts/build_image_resolution.py），
+  /// 结构 {菜名: {of, match, score}}；只补 images.json 中没有的菜名，避免运行时再查维基百科。
+  Future<void> _overlayResolution(Map<String, AssetImageInfo> map) async {
+    try {
+      final text = await rootBundle.loadString('assets/recipes/image_resolution.json');
+      final data = json.decode(text) as Map;
+      for (final e in data.entries) {
+        final name = e.key.toString();
+        final of = e.value is Map ? (e.value['of'] ?? '').toString() : '';
+        final info = map[of];
+        if (info != null && !map.containsKey(name)) map[name] = info;
+      }
     } catch (_) {
-      _map = {};
+      // 文件缺失或损坏时只用 images.json 精确匹配
     }
   }
 
   /// 返回本地 asset 路径（如存在）
   Future<String?> assetFor(String dishName) async {
+    await _ensureLoaded();
+    return _map![dishName]?.path;
+  }
+
+  /// 返回完整图片信息（含占位主色/缩略图），用于解码前先绘制占位
+  Future<AssetImageInfo?> infoFor(String dishName) async {
     await _ensureLoaded();
     return _map![dishName];
   }
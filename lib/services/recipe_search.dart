@@ -0,0 +1,128 @@
+import 'dart:io';
+import 'dart:math' as math;
+import 'dart:typed_data';
+import 'package:flutter/services.dart' show rootBundle;
+import 'package:path/path.dart' as p;
+import 'package:sqflite/sqflite.dart';
+
+/// 一条检索结果：菜名 + 菜系 key（用 name + cuisine 对应主库 recipes）
+class RecipeSearchHit {
+  final String name;
+  final String cuisine;
+  final double rank; // 负的 BM25 分数，越小越相关
+  const RecipeSearchHit(this.name, this.cuisine, this.rank);
+}
+
+/// 基于打包的 assets/recipes/search.db（SQLite FTS4，见 scripts/recipe_pipeline/search.py）按技法/食材查菜。
+/// 用 FTS4 是因为 sqflite 走 Android 系统 SQLite，没有 FTS5。
+/// 索引是预先切好的字二元组，这里的 [matchExpr] 与 [bm25] 必须与 Python 端 match_expr / bm25 保持一致。
+class RecipeSearch {
+  RecipeSearch._();
+  static final RecipeSearch instance = RecipeSearch._();
+
+  static const _asset = 'assets/recipes/search.db';
+  static const _weights = [10.0, 2.0, 1.0]; // name, cuisine, instructions
+  static const _k1 = 1.2, _b = 0.75;
+  static final _run = RegExp(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+|[A-Za-z0-9]+');
+  static final _cjk = RegExp(r'^[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]');
+
+  Database? _db;
+
+  Future<Database> _open() async {
+    if (_db != null) return _db!;
+    final path = p.join(await getDatabasesPath(), 'search.db');
+    // sqflite 只能打开文件：首次（或 App 更新后 asset 变化）把 asset 拷出来。
+    // 是否过期看 SQLite 文件头里的 user_version（构建时写入的内容指纹），不看长度——整页文件长度常常不变
+    final data = await rootBundle.load(_asset);
+    final bytes = data.buffer.asUint8List(data.offsetInBytes, data.lengthInBytes);
+    final file = File(path);
+    if (!await file.exists() || !await _sameVersion(file, bytes)) {
+      final tmp = File('$path.tmp');
+      await tmp.writeAsBytes(bytes, flush: true);
+      await tmp.rename(path);
+    }
+    _db = await openDatabase(path, readOnly: true);
+    return _db!;
+  }
+
+  /// 文件头 60..63 字节为 user_version（大端）；与 asset 一致且长度相同才复用已拷出的副本
+  static Future<bool> _sameVersion(File file, Uint8List asset) async {
+    if (asset.length < 64 || await file.length() != asset.length) return false;
+    final raf = await file.open();
+    try {
+      final head = await raf.read(64);
+      if (head.length < 64) return false;
+      for (var i = 60; i < 64; i++) {
+        if (head[i] != asset[i]) return false;
+      }
+      return true;
+    } finally {
+      await raf.close();
+    }
+  }
+
+  /// 用户输入 -> FTS4 MATCH 表达式：多字词为 bigram 短语，单字为前缀，多个词以空格相连（AND）
+  static String matchExpr(String query) {
+    final parts = <String>[];
+    for (final m in _run.allMatches(query)) {
+      final run = m.group(0)!;
+      if (!_cjk.hasMatch(run)) {
+        parts.add('"${run.toLowerCase()}"');
+      } else if (run.length == 1) {
+        parts.add('$run*');
+      } else {
+        final grams = [for (var i = 0; i < run.length - 1; i++) run.substring(i, i + 2)];
+        parts.add('"${grams.join(' ')}"');
+      }
+    }
+    return parts.join(' ');
+  }
+
+  /// matchinfo 'pcnalx'（本机字节序的 uint32 数组）-> BM25 分数，越大越相关
+  static double bm25(Uint8List matchinfo) {
+    final mi = matchinfo.buffer.asByteData(matchinfo.offsetInBytes, matchinfo.lengthInBytes);
+    int at(int i) => mi.getUint32(i * 4, Endian.host);
+    final phrases = at(0), cols = at(1), n = at(2);
+    final x = 3 + 2 * cols;
+    var score = 0.0;
+    for (var i = 0; i < phrases; i++) {
+      for (var j = 0; j < cols; j++) {
+        final base = x + 3 * (i * cols + j);
+        final hits = at(base), docs = at(base + 2);
+        if (hits == 0 || j >= _weights.length) continue;
+        final idf = math.max(math.log((n - docs + 0.5) / (docs + 0.5)), 1e-6);
+        final norm = _k1 * (1 - _b + _b * at(3 + cols + j) / math.max(at(3 + j), 1));
+        score += _weights[j] * idf * hits * (_k1 + 1) / (hits + norm);
+      }
+    }
+    return score;
+  }
+
+  Future<List<RecipeSearchHit>> search(String query, {int limit = 20}) async {
+    final expr = matchExpr(query);
+    if (expr.isEmpty) return const [];
+    try {
+      final d = await _open();
+      // FTS4 没有内置排序：取全部命中的 matchinfo 在这里打分，再按 id 回表取前 limit 条
+      final rows = await d.rawQuery(
+        "SELECT rowid, matchinfo(recipe_fts, 'pcnalx') AS mi FROM recipe_fts "
+        'WHERE recipe_fts MATCH ?',
+        [expr],
+      );
+      final scored = [
+        for (final r in rows) (id: r['rowid'] as int, rank: -bm25(r['mi'] as Uint8List)),
+      ]..sort((a, b) => a.rank != b.rank ? a.rank.compareTo(b.rank) : a.id.compareTo(b.id));
+      final hits = <RecipeSearchHit>[];
+      for (final s in scored.take(limit)) {
+        final r = await d.query('recipes',
+            columns: ['name', 'cuisine'], where: 'id = ?', whereArgs: [s.id]);
+        if (r.isEmpty) continue;
+        hits.add(RecipeSearchHit(r.first['name'] as String, r.first['cuisine'] as String, s.rank));
+      }
+      return hits;
+    } catch (_) {
+      // asset 缺失或损坏：没有检索结果
+      return const [];
+    }
+  }
+}
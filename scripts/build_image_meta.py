@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+为 assets/recipes/images.json 中的每张本地图片预计算元信息，写回 images.json：
+  - width/height/aspect：只解析文件头得到的尺寸与宽高比，App 布局时无需先解码
+  - bytes/sha1         ：文件大小与内容哈希
+  - color              ：主色（#rrggbb），列表/详情页可立即用纯色铺底
+  - lqip               ：极小尺寸的 WebP 缩略图（data URI，约几百字节），可直接内联显示模糊预览
+
+images.json 的值兼容两种形式：
+  "宫保鸡丁": "assets/images/宫保鸡丁.webp"                      （旧：仅路径）
+  "宫保鸡丁": {"path": "assets/images/宫保鸡丁.webp", "width": 1200, "height": 800, "aspect": 1.5,
+              "bytes": 98765, "sha1": "...", "color": "#a0522d", "lqip": "data:image/webp;base64,..."}
+读取方只需：字符串即路径；对象则取 path 字段。
+
+尺寸只读文件头（WebP/PNG/JPEG/GIF），不做解码；color/lqip 需要解码，
+仅在 sha1 变化时重算，因此重复运行只有读头 + 哈希的开销。
+
+依赖：Pillow（pip install pillow，仅生成 color/lqip 时需要）
+"""
+import os, io, json, sys, base64, struct, hashlib
+
+try:
+    from PIL import Image
+except ImportError:  # 没有 Pillow 时仍可生成尺寸/哈希
+    Image = None
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+MAP_FILE = os.path.join(ROOT, "assets", "recipes", "images.json")
+
+LQIP_SIZE = 16       # 缩略图最长边（像素）
+LQIP_QUALITY = 30    # WebP 质量，占位图足够
+PALETTE_COLORS = 8   # 主色提取时的量化颜色数
+
+def entry_path(v) -> str:
+    """images.json 的值可能是字符串路径，也可能是带 path 字段的对象；其它脚本都从这里导入"""
+    if isinstance(v, dict):
+        return str(v.get("path") or "")
+    return v if isinstance(v, str) else ""
+
+# ------------------------- 文件头解析（不解码） -------------------------
+def _webp_size(head: bytes):
+    if len(head) < 30 or head[:4] != b"RIFF" or head[8:12] != b"WEBP":
+        return None
+    chunk = head[12:16]
+    if chunk == b"VP8 ":
+        # 有损：帧头 3 字节 + 起始码 9d 01 2a，随后 14bit 宽/高
+        if head[23:26] != b"\x9d\x01\x2a":
+            return None
+        w, h = struct.unpack("<HH", head[26:30])
+        return w & 0x3FFF, h & 0x3FFF
+    if chunk == b"VP8L":
+        # 无损：签名 0x2f，随后 14bit (宽-1) 与 14bit (高-1)
+        if head[20] != 0x2F:
+            return None
+        bits = int.from_bytes(head[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        # 扩展：4 字节标志后是 24bit (宽-1) 与 24bit (高-1)
+        w = int.from_bytes(head[24:27], "little") + 1
+        h = int.from_bytes(head[27:30], "little") + 1
+        return w, h
+    return None
+
+def _png_size(head: bytes):
+    if head[:8] != b"\x89PNG\r\n\x1a\n" or head[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", head[16:24])
+
+def _gif_size(head: bytes):
+    if head[:6] not in (b"GIF87a", b"GIF89a"):
+        return None
+    return struct.unpack("<HH", head[6:10])
+
+def _jpeg_size(f):
+    # 逐个段跳读，直到 SOFn（C4/C8/CC 不是帧头）
+    f.seek(2)
+    while True:
+        b = f.read(1)
+        while b and b != b"\xff":
+            b = f.read(1)
+        while b == b"\xff":
+            b = f.read(1)
+        if not b:
+            return None
+        marker = b[0]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            continue
+        seg = f.read(2)
+        if len(seg) < 2:
+            return None
+        seg_len = struct.unpack(">H", seg)[0]
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            data = f.read(5)
+            if len(data) < 5:
+                return None
+            h, w = struct.unpack(">HH", data[1:5])
+            return w, h
+        f.seek(seg_len - 2, 1)
+
+def image_size(abs_path: str):
+    """只读文件头返回 (width, height)，无法识别时返回 None"""
+    with open(abs_path, "rb") as f:
+        head = f.read(32)
+        if head[:2] == b"\xff\xd8":
+            return _jpeg_size(f)
+    return _webp_size(head) or _png_size(head) or _gif_size(head)
+
+def file_sha1(abs_path: str) -> str:
+    h = hashlib.sha1()
+    with open(abs_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 256), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+# ------------------------- 占位图（需要解码） -------------------------
+def dominant_color(im) -> str:
+    # 先缩小再量化，取像素数最多的颜色
+    small = im.convert("RGB")
+    small.thumbnail((64, 64))
+    q = small.quantize(colors=PALETTE_COLORS)
+    palette = q.getpalette()
+    _, idx = max(q.getcolors())
+    r, g, b = palette[idx * 3: idx * 3 + 3]
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+def lqip_data_uri(im) -> str:
+    tiny = im.convert("RGB")
+    tiny.thumbnail((LQIP_SIZE, LQIP_SIZE))
+    buf = io.BytesIO()
+    tiny.save(buf, format="WEBP", quality=LQIP_QUALITY, method=6)
+    return "data:image/webp;base64," + base64.b64encode(buf.getvalue()).decode("ascii")
+
+def placeholders(abs_path: str) -> dict:
+    with Image.open(abs_path) as im:
+        im.draft("RGB", (LQIP_SIZE * 8, LQIP_SIZE * 8))  # JPEG 可按比例快速解码
+        return {"color": dominant_color(im), "lqip": lqip_data_uri(im)}
+
+def build_entry(path: str, old: dict) -> tuple[dict | None, bool]:
+    """返回 (新条目, 是否重算了占位图)；文件不存在时条目为 None"""
+    abs_path = os.path.join(ROOT, path)
+    if not os.path.exists(abs_path):
+        return None, False
+    entry = {"path": path}
+    size = image_size(abs_path)
+    if size:
+        w, h = size
+        entry.update(width=w, height=h, aspect=round(w / h, 4) if h else None)
+    entry["bytes"] = os.path.getsize(abs_path)
+    entry["sha1"] = file_sha1(abs_path)
+
+    # 内容未变则沿用旧占位图
+    if old.get("sha1") == entry["sha1"] and old.get("lqip"):
+        entry["color"] = old.get("color")
+        entry["lqip"] = old["lqip"]
+        return entry, False
+    if Image is None:
+        return entry, False
+    entry.update(placeholders(abs_path))
+    return entry, True
+
+def main():
+    if not os.path.exists(MAP_FILE):
+        print("images.json not found, skip.")
+        return 0
+    with open(MAP_FILE, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if Image is None:
+        print("[warn] Pillow not installed; only sizes/hashes will be updated.")
+
+    done, decoded, missing, failed = 0, 0, 0, 0
+    for name, v in list(data.items()):
+        path = entry_path(v)
+        if not path:
+            continue
+        old = v if isinstance(v, dict) and v.get("path") == path else {}
+        try:
+            entry, redone = build_entry(path, old)
+        except Exception as e:
+            print(f"  [err] {name}: {e}")
+            failed += 1
+            continue
+        if entry is None:
+            print(f"  [missing] {name}: {path}")
+            missing += 1
+            continue
+        # 保留对象里的其它字段；图片内容变了（同路径换图）时旧的占位图作废，
+        # 没有 Pillow 重算不了也不能沿用，否则会显示上一张图的预览
+        if old.get("sha1") != entry["sha1"]:
+            old = {k: v for k, v in old.items() if k not in ("color", "lqip")}
+        data[name] = {**old, **entry}
+        done += 1
+        decoded += redone
+
+    with open(MAP_FILE, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    print(f"[done] entries={done}, placeholders_recomputed={decoded}, missing={missing}, failed={failed}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按菜系把 assets/images 打成图片包，便于按需下载/解压，而不是把所有散图平铺进 APK：
+  assets/packs/<cuisine>.pack   （8 字节头 + 图片字节顺序拼接，不压缩：WebP 本身已压缩）
+  assets/packs/index.json       （偏移索引）
+
+index.json 结构：
+  {
+    "version": 1,
+    "packs": {"chuancai": {"file": "chuancai.pack", "bytes": 123, "sha1": "...", "count": 10}, ...},
+    "items": {"宫保鸡丁": {"pack": "chuancai", "offset": 8, "length": 4567, "path": "assets/images/宫保鸡丁.webp"}, ...}
+  }
+读取任意一张图只需：查 items -> 打开（或 mmap）对应 pack -> 一次 seek + 一次 read。
+
+菜系来自 seed_more.json 的 cuisine 字段；不在 seed 里的菜名归入 misc 包。
+同一文件被多个菜名引用时在包内只存一份；index.json 里没有的旧 .pack（菜系已不存在）会被删掉。
+运行结束打印与散文件相比的体积开销（含 4KiB 块对齐下的磁盘占用）。
+
+现状：只是按需下载的前期准备。App 仍直接打包 assets/images/，AssetImageResolver 不读 .pack；
+assets/packs/ 不入库，只作为 optimize-images 工作流的产物上传。
+"""
+import os, json, sys, mmap, hashlib
+
+from build_image_meta import entry_path
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+REC_DIR = os.path.join(ROOT, "assets", "recipes")
+MAP_FILE = os.path.join(REC_DIR, "images.json")
+SEED_MORE = os.path.join(REC_DIR, "seed_more.json")
+PACK_DIR = os.path.join(ROOT, "assets", "packs")
+INDEX_FILE = os.path.join(PACK_DIR, "index.json")
+
+PACK_MAGIC = b"BCPK\x00\x00\x00\x01"  # 魔数 + 版本号 1
+MISC = "misc"
+BLOCK = 4096  # 估算散文件磁盘占用时的块大小
+
+def load_cuisine_by_name() -> dict:
+    if not os.path.exists(SEED_MORE):
+        return {}
+    with open(SEED_MORE, "r", encoding="utf-8") as f:
+        arr = json.load(f)
+    out = {}
+    for it in arr if isinstance(arr, list) else []:
+        nm = str(it.get("name", "")).strip()
+        if nm and nm not in out:  # 同名出现在多个菜系时取第一个
+            out[nm] = it.get("cuisine") or MISC
+    return out
+
+def group_by_cuisine(mapping: dict, cuisine_by_name: dict) -> dict:
+    """返回 {cuisine: [(name, path), ...]}，只含文件真实存在的条目"""
+    groups: dict[str, list] = {}
+    for name in sorted(mapping):
+        path = entry_path(mapping[name])
+        if not path or not os.path.exists(os.path.join(ROOT, path)):
+            continue
+        groups.setdefault(cuisine_by_name.get(name, MISC), []).append((name, path))
+    return groups
+
+def write_pack(cuisine: str, items: list, index_items: dict) -> dict:
+    fname = f"{cuisine}.pack"
+    h = hashlib.sha1()
+    offsets = {}  # path -> (offset, length)，同一文件只写一次
+    with open(os.path.join(PACK_DIR, fname), "wb") as out:
+        out.write(PACK_MAGIC)
+        h.update(PACK_MAGIC)
+        for name, path in items:
+            if path not in offsets:
+                with open(os.path.join(ROOT, path), "rb") as f:
+                    data = f.read()
+                offsets[path] = (out.tell(), len(data))
+                out.write(data)
+                h.update(data)
+            off, length = offsets[path]
+            index_items[name] = {"pack": cuisine, "offset": off, "length": length, "path": path}
+        size = out.tell()
+    return {"file": fname, "bytes": size, "sha1": h.hexdigest(), "count": len(offsets)}
+
+def prune_stale_packs(packs: dict, pack_dir: str = PACK_DIR) -> list:
+    """删除 pack_dir 中不在本次索引里的 .pack，返回删掉的文件名"""
+    keep = {p["file"] for p in packs.values()}
+    stale = sorted(f for f in os.listdir(pack_dir) if f.endswith(".pack") and f not in keep)
+    for f in stale:
+        os.remove(os.path.join(pack_dir, f))
+    return stale
+
+# ------------------------- 读取（供校验/按需解包使用） -------------------------
+_mmaps: dict = {}
+
+def read_image(index: dict, name: str, pack_dir: str = PACK_DIR) -> bytes | None:
+    """按索引从包中取出一张图：mmap 后直接切片（即一次 seek + 一次 read）"""
+    it = index.get("items", {}).get(name)
+    if not it:
+        return None
+    fname = index["packs"][it["pack"]]["file"]
+    mm = _mmaps.get(fname)
+    if mm is None:
+        with open(os.path.join(pack_dir, fname), "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _mmaps[fname] = mm
+    return mm[it["offset"]: it["offset"] + it["length"]]
+
+def report(groups: dict, packs: dict, index_bytes: int):
+    paths = {p for items in groups.values() for _, p in items}
+    loose = sum(os.path.getsize(os.path.join(ROOT, p)) for p in paths)
+    loose_disk = sum(-(-os.path.getsize(os.path.join(ROOT, p)) // BLOCK) * BLOCK for p in paths)
+    packed = sum(p["bytes"] for p in packs.values())
+    packed_disk = sum(-(-p["bytes"] // BLOCK) * BLOCK for p in packs.values())
+    overhead = packed + index_bytes - loose
+    print(f"[report] files={len(paths)} packs={len(packs)}")
+    print(f"  loose bytes      : {loose}")
+    print(f"  packs + index    : {packed + index_bytes} (index={index_bytes})")
+    print(f"  archive overhead : {overhead:+d} bytes ({overhead / loose * 100 if loose else 0:+.2f}%)")
+    print(f"  on-disk (4KiB)   : loose={loose_disk}, packs={packed_disk + index_bytes}")
+    for c in sorted(packs):
+        print(f"  - {c}: {packs[c]['count']} images, {packs[c]['bytes']} bytes")
+
+def main():
+    if not os.path.exists(MAP_FILE):
+        print("images.json not found, skip.")
+        return 0
+    with open(MAP_FILE, "r", encoding="utf-8") as f:
+        mapping = json.load(f)
+
+    groups = group_by_cuisine(mapping, load_cuisine_by_name())
+    if not groups:
+        print("No local images; nothing to pack.")
+        return 0
+
+    os.makedirs(PACK_DIR, exist_ok=True)
+    packs, items = {}, {}
+    for cuisine in sorted(groups):
+        packs[cuisine] = write_pack(cuisine, groups[cuisine], items)
+    index = {"version": 1, "packs": packs, "items": items}
+    with open(INDEX_FILE, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    for f in prune_stale_packs(packs):
+        print(f"[prune] {f}")
+
+    # 逐条校验：包内字节与原文件一致
+    for name, it in items.items():
+        with open(os.path.join(ROOT, it["path"]), "rb") as f:
+            if read_image(index, name) != f.read():
+                print(f"[err] pack mismatch: {name}")
+                return 1
+
+    report(groups, packs, os.path.getsize(INDEX_FILE))
+    print(f"[done] {INDEX_FILE}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
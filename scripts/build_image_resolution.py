@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+为菜谱目录中的每个菜名预先解析“用哪张本地图片”，写入 assets/recipes/image_resolution.json，
+让 App 在 images.json 精确查不到时，不必再走运行时的维基百科网络请求。
+
+匹配顺序（命中即止）：
+  1) exact      ：images.json 中有同名且文件存在 -> 不写入（App 直接查 images.json）
+  2) alias      ：ALIASES 人工别名表（如 叫化鸡 -> 叫花鸡）
+  3) normalized ：归一化后相同（繁→简、异体字、去括号/空白，如 松鼠鳜鱼 -> 松鼠桂鱼）
+  4) fuzzy      ：字二元组（bigram）Dice 相似度 >= FUZZY_THRESHOLD，取分数最高者
+                  （用 bigram 倒排索引只比较至少共享一个 bigram 的候选）；
+                  另要求中心词一致：两者先去掉末尾的刀工/器皿后缀（MODIFIER_SUFFIXES：丁/片/块/丝/煲…），
+                  较短者的末两字（中文菜名的中心词在末尾）须是较长者的结尾——
+                  辣子鸡丁 -> 辣子鸡、清蒸鲈鱼片 -> 清蒸鲈鱼、清炖蟹粉狮子头 -> 蟹粉狮子头 照常命中，
+                  辣椒炒蛋 -> 辣椒炒肉、臭鳜鱼豆腐/甲鱼/河鱼 -> 臭鳜鱼 这类换了主料的误配被挡住；
+                  这些用例写在 MUST_MATCH / MUST_NOT_MATCH 里，每次运行先自检
+
+输出结构：{"辣子鸡丁": {"of": "辣子鸡", "match": "fuzzy", "score": 0.8}, ...}
+"of" 为 images.json 中的键；App 用它取实际路径与占位信息。
+"""
+import os, re, sys, json
+
+from build_image_meta import entry_path
+from recipe_pipeline.catalog import load_names
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+REC_DIR = os.path.join(ROOT, "assets", "recipes")
+MAP_FILE = os.path.join(REC_DIR, "images.json")
+OUT_FILE = os.path.join(REC_DIR, "image_resolution.json")
+
+FUZZY_THRESHOLD = 0.65
+HEAD_CHARS = 2  # 中心词取菜名末尾几个字
+# 比较中心词前去掉的末尾后缀：只改刀工/盛器，不改主料（辣子鸡丁 与 辣子鸡 是同一道菜）
+MODIFIER_SUFFIXES = ("丁", "片", "块", "丝", "条", "段", "煲")
+
+# 自检用例：(菜名, 图片键)。前者绝不能解析到后者；后者必须解析到
+MUST_NOT_MATCH = [
+    ("臭鳜鱼甲鱼", "臭鳜鱼"),
+    ("臭鳜鱼河鱼", "臭鳜鱼"),
+    ("臭鳜鱼豆腐", "臭鳜鱼"),
+    ("辣椒炒蛋", "辣椒炒肉"),
+]
+MUST_MATCH = [
+    ("辣子鸡丁", "辣子鸡"),
+    ("宫保鸡", "宫保鸡丁"),
+    ("麻婆豆腐煲", "麻婆豆腐"),
+    ("清蒸鲈鱼片", "清蒸鲈鱼"),
+    ("清炖蟹粉狮子头", "蟹粉狮子头"),
+    ("松鼠鳜鱼", "松鼠桂鱼"),
+]
+
+# 人工别名：菜名 -> images.json 中的键（同一道菜的不同叫法）
+ALIASES = {
+    "叫化鸡": "叫花鸡",
+    "叫化童鸡": "叫花鸡",
+    "松鼠鳜鱼": "松鼠桂鱼",
+    "松鼠鱼": "松鼠桂鱼",
+    "东坡焖肉": "东坡肉",
+    "白斩鸡": "白切鸡",
+    "狮子头": "四喜丸子",
+    "清炖狮子头": "四喜丸子",
+    "水煮鱼片": "水煮鱼",
+    "海蛎煎饼": "海蛎煎",
+    "蚵仔煎": "海蛎煎",
+    "毛家红烧肉": "毛氏红烧肉",
+}
+
+# 归一化：繁→简与常见异体字（只收菜名里常见的）
+_CHAR_MAP = str.maketrans({
+    "雞": "鸡", "鴨": "鸭", "鵝": "鹅", "魚": "鱼", "鱸": "鲈", "鯉": "鲤", "鱖": "鳜", "蝦": "虾",
+    "豬": "猪", "腸": "肠", "燒": "烧", "鍋": "锅", "麵": "面", "絲": "丝", "醬": "酱", "滷": "卤",
+    "湯": "汤", "蔥": "葱", "餅": "饼", "飯": "饭", "釀": "酿", "臘": "腊", "燉": "炖", "爐": "炉",
+    "魷": "鱿", "蠔": "蚝", "蠣": "蛎", "頭": "头", "塊": "块", "條": "条", "參": "参", "蘿": "萝",
+    "蔔": "卜", "鮮": "鲜", "膾": "脍",
+    "鳜": "桂",   # 鳜鱼/桂鱼
+})
+_STRIP_RE = re.compile(r"[\s（）()\[\]【】·•・]|（菜肴）|\(菜肴\)")
+
+def normalize(name: str) -> str:
+    return _STRIP_RE.sub("", name.replace("（菜肴）", "").replace("(菜肴)", "")).translate(_CHAR_MAP)
+
+def core(name: str) -> str:
+    """归一化后去掉一个末尾修饰后缀（至少留两个字）"""
+    s = normalize(name)
+    return s[:-1] if len(s) > 2 and s.endswith(MODIFIER_SUFFIXES) else s
+
+def same_head(a: str, b: str) -> bool:
+    """较短菜名的中心词（去后缀后的末 HEAD_CHARS 字）是否为较长菜名（去后缀后）的结尾"""
+    short, long_ = sorted((core(a), core(b)), key=len)
+    return long_.endswith(short[-HEAD_CHARS:])
+
+def bigrams(s: str) -> set:
+    return {s[i:i + 2] for i in range(len(s) - 1)} if len(s) > 1 else {s}
+
+class BigramIndex:
+    """bigram 倒排索引 + Dice 相似度"""
+
+    def __init__(self, keys):
+        self.grams = {}
+        self.postings: dict[str, set] = {}
+        for k in keys:
+            g = bigrams(normalize(k))
+            self.grams[k] = g
+            for b in g:
+                self.postings.setdefault(b, set()).add(k)
+
+    def best(self, name: str):
+        """返回 (key, score)；按 分数高 > 长度差小 > 键字典序 排名，保证结果稳定"""
+        g = bigrams(normalize(name))
+        cands = set()
+        for b in g:
+            cands |= self.postings.get(b, set())
+        ranked = sorted(
+            ((2 * len(g & self.grams[k]) / (len(g) + len(self.grams[k])), k)
+             for k in cands if same_head(name, k)),
+            key=lambda t: (-t[0], abs(len(t[1]) - len(name)), t[1]),
+        )
+        return (ranked[0][1], ranked[0][0]) if ranked else (None, 0.0)
+
+def resolve(catalog: set, available: set) -> dict:
+    by_norm: dict[str, str] = {}
+    for k in sorted(available):
+        by_norm.setdefault(normalize(k), k)
+    index = BigramIndex(available)
+
+    out = {}
+    for name in sorted(catalog):
+        if name in available:
+            continue
+        alias = ALIASES.get(name)
+        if alias in available:
+            out[name] = {"of": alias, "match": "alias", "score": 1.0}
+            continue
+        norm = by_norm.get(normalize(name))
+        if norm:
+            out[name] = {"of": norm, "match": "normalized", "score": 1.0}
+            continue
+        key, score = index.best(name)
+        if key and score >= FUZZY_THRESHOLD:
+            out[name] = {"of": key, "match": "fuzzy", "score": round(score, 3)}
+    return out
+
+def self_check():
+    """MUST_NOT_MATCH / MUST_MATCH 回归用例；不通过时抛 ValueError，不写出错误的映射"""
+    for name, key in MUST_NOT_MATCH:
+        got = resolve({name}, {key}).get(name)
+        if got:
+            raise ValueError(f"{name} must not resolve to {key}: {got}")
+    for name, key in MUST_MATCH:
+        got = resolve({name}, {key}).get(name)
+        if not got or got["of"] != key:
+            raise ValueError(f"{name} should resolve to {key}: {got}")
+
+def main():
+    self_check()
+    if not os.path.exists(MAP_FILE):
+        print("images.json not found, skip.")
+        return 0
+    with open(MAP_FILE, "r", encoding="utf-8") as f:
+        mapping = json.load(f)
+    available = {k for k, v in mapping.items()
+                 if entry_path(v) and os.path.exists(os.path.join(ROOT, entry_path(v)))}
+    catalog = load_names()
+
+    out = resolve(catalog, available)
+    with open(OUT_FILE, "w", encoding="utf-8") as f:
+        json.dump(out, f, ensure_ascii=False, indent=2)
+
+    exact = len(catalog & available)
+    kinds = {}
+    for v in out.values():
+        kinds[v["match"]] = kinds.get(v["match"], 0) + 1
+    miss = len(catalog) - exact - len(out)
+    print(f"[done] catalog={len(catalog)} exact={exact} "
+          + " ".join(f"{k}={kinds[k]}" for k in sorted(kinds))
+          + f" unresolved={miss} -> {OUT_FILE}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+由 seed_more.json 生成全文检索库 assets/recipes/search.db（SQLite FTS4，结构见 recipe_pipeline/search.py）。
+
+用法：
+  python scripts/build_search_db.py                    # 重建 search.db
+  python scripts/build_search_db.py -q 豆瓣 -q "清蒸 鱼"  # 重建后试查
+  python scripts/build_search_db.py --bench 100000     # 另建 10 万条合成菜谱的库，测查询延迟
+"""
+import sys, sqlite3, argparse
+
+from recipe_pipeline import load_seed
+from recipe_pipeline.search import SEARCH_DB, write_search_db, search, bench
+
+def main():
+    ap = argparse.ArgumentParser(description="Build the FTS4 recipe search database.")
+    ap.add_argument("-q", "--query", action="append", default=[], help="run a test query after building")
+    ap.add_argument("--bench", type=int, default=0, metavar="N",
+                    help="also benchmark query latency on N synthetic recipes")
+    args = ap.parse_args()
+
+    seed = load_seed()
+    if not seed:
+        print("seed_more.json is empty; nothing to index.")
+        return 0
+    write_search_db(seed)
+
+    if args.query:
+        conn = sqlite3.connect(f"file:{SEARCH_DB}?mode=ro", uri=True)
+        for q in args.query:
+            rows = search(conn, q, limit=10)
+            print(f"[query] {q}: " + (", ".join(f"{name}({cui})" for _, name, cui, _ in rows) or "-"))
+        conn.close()
+    if args.bench:
+        bench(seed, args.bench)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
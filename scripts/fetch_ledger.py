@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+抓图尝试台账：assets/recipes/fetch_ledger.db（SQLite，只追加）。
+
+每道菜每次尝试记一行 attempts(run_id, name, ts, strategy, source, status, latency_ms, meta, error)，
+每次运行记一行 runs。UPDATE / DELETE 由触发器禁止，历史不会被覆盖。
+
+用途：
+  - 负缓存 + 退避：自上次成功以来连续失败 k 次的菜，在最近一次失败后
+    BACKOFF_DAYS[min(k, 4) - 1] 天（1、3、7、30 天）内不再尝试；fetch_wiki_images.py --force 忽略退避；
+  - 报告：fetch_report.md 末尾由台账生成历次运行趋势、退避队列与长期失败清单；
+  - 分片：各分片写 fetch_ledger.shard-i-of-N.db（只含本次新增），退避判断同时读主台账；
+    merge_fetch_shards.py 用 merge_into() 去重并入主台账。
+
+单独运行打印台账摘要：python scripts/fetch_ledger.py
+"""
+import os, sys, time, sqlite3, statistics
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+REC_DIR = os.path.join(ROOT, "assets", "recipes")
+LEDGER_DB = os.path.join(REC_DIR, "fetch_ledger.db")
+
+BACKOFF_DAYS = (1, 3, 7, 30)
+OK_STATUSES = ("downloaded",)
+CHRONIC_FAILS = 3  # 连续失败达到该次数列入“长期失败”
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs(
+  run_id TEXT PRIMARY KEY,
+  started_at REAL NOT NULL,
+  mode TEXT NOT NULL,
+  shard TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS attempts(
+  id INTEGER PRIMARY KEY,
+  run_id TEXT NOT NULL,
+  name TEXT NOT NULL,
+  ts REAL NOT NULL,
+  strategy TEXT NOT NULL,
+  source TEXT NOT NULL DEFAULT '',
+  status TEXT NOT NULL,
+  latency_ms INTEGER,
+  meta TEXT NOT NULL DEFAULT '',
+  error TEXT NOT NULL DEFAULT '',
+  UNIQUE(run_id, name, ts)
+);
+CREATE INDEX IF NOT EXISTS attempts_name_ts ON attempts(name, ts);
+CREATE TRIGGER IF NOT EXISTS attempts_no_update BEFORE UPDATE ON attempts
+  BEGIN SELECT RAISE(ABORT, 'fetch ledger is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS attempts_no_delete BEFORE DELETE ON attempts
+  BEGIN SELECT RAISE(ABORT, 'fetch ledger is append-only'); END;
+"""
+
+_COLS = "run_id, name, ts, strategy, source, status, latency_ms, meta, error"
+
+def _fmt_day(ts: float) -> str:
+    return time.strftime("%Y-%m-%d", time.localtime(ts))
+
+class Ledger:
+    """path：本次写入的库；base：同时参与查询的主台账（分片运行时为 LEDGER_DB）"""
+
+    def __init__(self, path: str = LEDGER_DB, base: str | None = None):
+        self.path = path
+        # 抓取线程共用一个连接；调用方（FetchRun）持锁写入；autocommit，中途被杀也不丢记录
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.executescript(_SCHEMA)
+        self.source = f"(SELECT {_COLS} FROM attempts)"
+        self.runs_source = "runs"
+        if base and os.path.abspath(base) != os.path.abspath(path) and os.path.exists(base):
+            self.conn.execute("ATTACH DATABASE ? AS base", (base,))
+            self.source = f"(SELECT {_COLS} FROM attempts UNION ALL SELECT {_COLS} FROM base.attempts)"
+            self.runs_source = "(SELECT * FROM runs UNION ALL SELECT * FROM base.runs)"
+        self.run_id = None
+
+    def close(self):
+        self.conn.close()
+
+    # ---------------- 写入 ----------------
+    def start_run(self, mode: str, shard: str = "") -> str:
+        now = time.time()
+        self.run_id = time.strftime("%Y%m%dT%H%M%S", time.gmtime(now)) + (f"-{shard}" if shard else "") \
+            + f"-{os.getpid()}"
+        self.conn.execute("INSERT INTO runs(run_id, started_at, mode, shard) VALUES(?, ?, ?, ?)",
+                          (self.run_id, now, mode, shard))
+        return self.run_id
+
+    def record(self, name: str, strategy: str, status: str, source: str = "", meta: str = "",
+               error: str = "", latency_ms: int | None = None):
+        self.conn.execute(
+            f"INSERT OR IGNORE INTO attempts({_COLS}) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (self.run_id, name, time.time(), strategy, source or "", status, latency_ms,
+             meta or "", (error or "")[:500]))
+
+    def merge_into(self, other_path: str) -> int:
+        """把另一个台账（分片产物）并入本库；按 (run_id, name, ts) 去重，可重复执行"""
+        before = self.conn.total_changes
+        self.conn.execute("ATTACH DATABASE ? AS src", (other_path,))
+        try:
+            self.conn.execute("BEGIN")
+            self.conn.execute("INSERT OR IGNORE INTO runs SELECT * FROM src.runs")
+            self.conn.execute(f"INSERT OR IGNORE INTO attempts({_COLS}) SELECT {_COLS} FROM src.attempts")
+            self.conn.execute("COMMIT")
+        finally:
+            self.conn.execute("DETACH DATABASE src")
+        return self.conn.total_changes - before
+
+    # ---------------- 退避 ----------------
+    def failure_streaks(self) -> dict:
+        """菜名 -> (自上次成功以来的连续失败次数, 最近一次失败时间, 最近状态)
+
+        一遍窗口扫描：每道菜按时间倒序，oks 为“该行及其之后的成功次数”，oks = 0 的行即最近一次成功之后的失败；
+        同一时刻的成功排在失败前面，与“ts 严格晚于最近成功”的口径一致。"""
+        ok = ",".join(f"'{s}'" for s in OK_STATUSES)
+        rows = self.conn.execute(f"""
+            WITH a AS {self.source},
+                 w AS (SELECT name, ts, status,
+                              ROW_NUMBER() OVER win AS rn,
+                              SUM(status IN ({ok})) OVER win AS oks
+                       FROM a
+                       WINDOW win AS (PARTITION BY name ORDER BY ts DESC, status IN ({ok}) DESC
+                                      ROWS UNBOUNDED PRECEDING))
+            SELECT name, SUM(oks = 0), MAX(CASE WHEN oks = 0 THEN ts END), MAX(CASE WHEN rn = 1 THEN status END)
+            FROM w
+            GROUP BY name
+            HAVING SUM(oks = 0) > 0
+        """).fetchall()
+        return {name: (n, last, status) for name, n, last, status in rows}
+
+    @staticmethod
+    def next_eligible(fails: int, last_ts: float) -> float:
+        return last_ts + BACKOFF_DAYS[min(fails, len(BACKOFF_DAYS)) - 1] * 86400
+
+    def backoff(self, names, now: float | None = None, streaks: dict | None = None) -> dict:
+        """names 中当前处于退避期的菜名 -> 下次可重试的时间戳；streaks 可传入已算好的 failure_streaks()"""
+        now = time.time() if now is None else now
+        streaks = self.failure_streaks() if streaks is None else streaks
+        out = {}
+        for name in names:
+            st = streaks.get(name)
+            if st:
+                due = self.next_eligible(st[0], st[1])
+                if due > now:
+                    out[name] = due
+        return out
+
+    # ---------------- 报告 ----------------
+    def run_stats(self, limit: int = 10) -> list:
+        """最近 limit 次运行：[(run_id, started_at, mode, attempted, ok, median_latency_ms)]"""
+        ok = ",".join(f"'{s}'" for s in OK_STATUSES)
+        runs = self.conn.execute(
+            f"SELECT run_id, started_at, mode FROM {self.runs_source} ORDER BY started_at DESC LIMIT ?",
+            (limit,)).fetchall()
+        out = []
+        for run_id, started, mode in runs:
+            rows = self.conn.execute(
+                f"SELECT status IN ({ok}), latency_ms FROM {self.source} WHERE run_id = ?", (run_id,)).fetchall()
+            lat = [l for _, l in rows if l is not None]
+            out.append((run_id, started, mode, len(rows), sum(1 for s, _ in rows if s),
+                        statistics.median(lat) if lat else None))
+        return out
+
+    def trend_markdown(self, names=None, now: float | None = None, streaks: dict | None = None) -> str:
+        """历次运行趋势 + 退避队列 + 长期失败；names 给定时只列这些菜名。
+        failure_streaks() 只算一次，退避表与长期失败清单共用；也可由调用方传入 streaks"""
+        now = time.time() if now is None else now
+        lines = ["## 历次运行（来自 fetch_ledger.db）\n",
+                 "| 运行 | 开始时间 | 模式 | 尝试 | 成功 | 成功率 | 中位耗时 |",
+                 "|---|---|---|---:|---:|---:|---:|"]
+        for run_id, started, mode, n, ok, med in self.run_stats():
+            rate = f"{ok / n * 100:.0f}%" if n else "-"
+            med_s = f"{med / 1000:.1f}s" if med is not None else "-"
+            lines.append(f"| {run_id} | {time.strftime('%Y-%m-%d %H:%M', time.localtime(started))} "
+                         f"| {mode} | {n} | {ok} | {rate} | {med_s} |")
+
+        streaks = self.failure_streaks() if streaks is None else streaks
+        if names is not None:
+            keep = set(names)
+            streaks = {k: v for k, v in streaks.items() if k in keep}
+        due = {name: self.next_eligible(n, last) for name, (n, last, _) in streaks.items()}
+        waiting = sorted((due[name], name, n, status) for name, (n, _, status) in streaks.items()
+                         if due[name] > now)
+        lines += ["", f"## 退避中（{len(waiting)}）\n"]
+        if waiting:
+            lines += ["| 菜名 | 连续失败 | 最近状态 | 下次可重试 |", "|---|---:|---|---|"]
+            lines += [f"| {name} | {n} | {status} | {_fmt_day(due)} |" for due, name, n, status in waiting[:50]]
+        chronic = sorted(name for name, (n, _, _) in streaks.items() if n >= CHRONIC_FAILS)
+        lines += ["", f"## 长期失败（连续失败 ≥ {CHRONIC_FAILS} 次，{len(chronic)}）\n"]
+        if chronic:
+            lines.append("、".join(chronic[:200]))
+        return "\n".join(lines) + "\n"
+
+def main():
+    if not os.path.exists(LEDGER_DB):
+        print(f"{LEDGER_DB} not found.")
+        return 0
+    ledger = Ledger(LEDGER_DB)
+    total = ledger.conn.execute("SELECT COUNT(*) FROM attempts").fetchone()[0]
+    print(f"[ledger] {LEDGER_DB}: {total} attempts")
+    print(ledger.trend_markdown())
+    ledger.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,12 +11,39 @@
   - assets/recipes/fetch_report.csv   （明细：name,status,source,lang/title/url,asset_path,error）
 特性：
   - 已有映射且文件存在 -> 跳过，不重复下载
+  - Wikimedia 图片直接请求目标宽度的缩略图（IMAGE_TARGET_WIDTH，默认 1600，与 optimize-images 一致），
+    不再下载多 MB 的原图；下载前先 HEAD 检查大小，超过 IMAGE_MAX_BYTES 的放弃
+  - 按优先级抓取：完全没有图的 > seed_more.json 中的 > 只在清单里的
+  - --max-seconds / --max-dishes 预算；定期把映射、报告与 fetch_state.json 落盘，
+    超时/崩溃后下次运行从断点继续（本轮已尝试过的菜名会跳过，一轮结束后重新开始）
+  - --shard i/N：按菜名稳定哈希分片，N 个 CI 任务并行抓取互不重叠的子集，
+    各自写 images.shard-i-of-N.json / fetch_report.shard-i-of-N.*，再用 merge_fetch_shards.py 合并
+  - --pipeline：下载与转码流水线并行，图片在内存中解码/缩放/编码为 WebP，
+    只写最终的 .webp，无需再跑 optimize-images（需要 Pillow）
+  - --hedged：每道菜并发发出多个 wiki 候选查询（每道菜最多 --hedge-width 个在途），wiki 全部失败才查 bing
+    （计费；设 HEDGE_BING_DELAY 秒数可提前发出），按与顺序模式相同的优先级取结果
+    （更靠前的候选都失败后才采用后面的），定下后中断其余在途请求；
+    每道菜的实际耗时与估算的顺序耗时写入 fetch_latency.csv
+  - 每次尝试追加到台账 fetch_ledger.db（见 fetch_ledger.py）：连续失败的菜按 1/3/7/30 天退避，
+    退避期内跳过（--force 忽略）；fetch_report.md 末尾附历次运行趋势与长期失败清单
   - 日志详细，便于排查
 """
 
-import os, re, json, sys, time, csv
+import os, io, re, json, sys, time, csv, queue, hashlib, argparse, threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from urllib.parse import quote
+import socket
 import requests
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from build_image_meta import entry_path
+from fetch_ledger import LEDGER_DB, Ledger
+from recipe_pipeline.catalog import load_names
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # 仅 --pipeline 需要 Pillow
+    Image = None
 
 ROOT = os.path.dirname(os.path.dirname(__file__))
 ASSETS = os.path.join(ROOT, "assets")
@@ -25,9 +52,9 @@ REC_DIR = os.path.join(ASSETS, "recipes")
 MAP_FILE = os.path.join(REC_DIR, "images.json")
 REPORT_MD = os.path.join(REC_DIR, "fetch_report.md")
 REPORT_CSV = os.path.join(REC_DIR, "fetch_report.csv")
-NAMES_FILE = os.path.join(REC_DIR, "seed_names.txt")
 SEED_MORE = os.path.join(REC_DIR, "seed_more.json")
-LISTS_DIR = os.path.join(REC_DIR, "lists")
+STATE_FILE = os.path.join(REC_DIR, "fetch_state.json")  # 断点续跑状态
+LATENCY_CSV = os.path.join(REC_DIR, "fetch_latency.csv")  # --hedged 时每道菜的查找耗时对比
 
 os.makedirs(IMG_DIR, exist_ok=True)
 os.makedirs(REC_DIR, exist_ok=True)
@@ -40,6 +67,12 @@ BING_ENDPOINT = "https://api.bing.microsoft.com/v7.0/images/search"
 BING_MKT = os.environ.get("BING_MARKET", "zh-CN")
 BING_SAFE = os.environ.get("BING_SAFE", "Moderate")  # Off/Moderate/Strict
 BING_LICENSE = os.environ.get("BING_LICENSE", "Any") # Any/All/Share/ShareCommercially/Modify/ModifyCommercially
+# --hedged：wiki 查找开始多少秒后仍未定下就提前发出 bing；不设则等 wiki 候选全部失败（与顺序模式同样的计费量）
+HEDGE_BING_DELAY = float(os.environ["HEDGE_BING_DELAY"]) if os.environ.get("HEDGE_BING_DELAY") else None
+
+# ==== 下载尺寸控制 ====
+THUMB_WIDTH = int(os.environ.get("IMAGE_TARGET_WIDTH", "1600"))              # 目标宽度（像素）
+MAX_DOWNLOAD_BYTES = int(os.environ.get("IMAGE_MAX_BYTES", str(4 * 1024 * 1024)))  # 单张上限（字节）
 
 # 常见菜名的英文别名映射（提高wiki命中率）
 ALT_TITLES = {
@@ -88,19 +121,143 @@ def ext_from_url(u: str) -> str:
     m = re.search(r"\.(jpg|jpeg|png|webp|gif)(?:\?|$)", u, re.I)
     return f".{m.group(1).lower()}" if m else ".jpg"
 
-def download(url: str, path: str):
-    r = requests.get(url, timeout=25, stream=True, headers=UA)
-    r.raise_for_status()
-    with open(path, "wb") as f:
+# upload.wikimedia.org 的原图与缩略图地址
+_WM_ORIG = re.compile(r"^(https://upload\.wikimedia\.org/wikipedia/[^/]+)/(\w/\w\w)/([^/]+)$")
+_WM_THUMB = re.compile(r"^(https://upload\.wikimedia\.org/wikipedia/[^/]+)/thumb/(\w/\w\w)/([^/]+)/[^/]*?\d+px-[^/]+$")
+# 缩略图名为 {width}px-{原文件名} 的格式；TIFF/PDF/DjVu 等的缩略图名另有前缀/后缀（如 lossy-page1-1600px-x.tif.jpg），不改写
+_WM_RESIZABLE = (".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg")
+
+def sized_wiki_url(url: str, orig_width: int | None = None, width: int = THUMB_WIDTH) -> str:
+    """已知原图宽度时，把 Wikimedia 原图/任意宽度缩略图地址改写为 width 宽的缩略图。
+    原图本身不超过 width 时直接用原图（缩略图服务不放大）；其它情况原样返回。"""
+    if url.startswith("//"):
+        url = "https:" + url
+    m = _WM_THUMB.match(url) or _WM_ORIG.match(url)
+    if not m:
+        return url
+    base, hashdir, fname = m.groups()
+    if not fname.lower().endswith(_WM_RESIZABLE):
+        return url
+    if not orig_width:
+        # 不知道原图宽度时不改写（请求比原图还宽的缩略图会报错）
+        return url
+    if orig_width <= width:
+        return f"{base}/{hashdir}/{fname}"
+    thumb = f"{width}px-{fname}"
+    if fname.lower().endswith(".svg"):
+        thumb += ".png"
+    return f"{base}/thumb/{hashdir}/{fname}/{thumb}"
+
+def probe_size(url: str) -> int | None:
+    """HEAD 获取 Content-Length；拿不到返回 None"""
+    try:
+        r = thread_session().head(url, timeout=10, headers=UA, allow_redirects=True)
+        if r.status_code == 200 and r.headers.get("Content-Length", "").isdigit():
+            return int(r.headers["Content-Length"])
+    except Exception as e:
+        print(f"  [HEAD err] {e}")
+    return None
+
+def iter_download(url: str, max_bytes: int = MAX_DOWNLOAD_BYTES):
+    """HEAD 预检大小后流式下载，逐块产出；超过 max_bytes 抛 ValueError"""
+    size = probe_size(url)
+    if size is not None and size > max_bytes:
+        raise ValueError(f"too large: {size} > {max_bytes} bytes")
+    # 超限/出错/调用方提前停止时都要关闭流式响应，否则多线程模式下连接会泄漏
+    with thread_session().get(url, timeout=25, stream=True, headers=UA) as r:
+        r.raise_for_status()
+        got = 0
         for chunk in r.iter_content(1024 * 64):
             if chunk:
+                got += len(chunk)
+                if got > max_bytes:  # 没有 Content-Length 时边下边查
+                    raise ValueError(f"too large: >{max_bytes} bytes")
+                yield chunk
+
+def download(url: str, path: str, max_bytes: int = MAX_DOWNLOAD_BYTES) -> int:
+    got = 0
+    try:
+        with open(path, "wb") as f:
+            for chunk in iter_download(url, max_bytes):
+                got += len(chunk)
                 f.write(chunk)
+    except Exception:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    return got
+
+def fetch_bytes(url: str, max_bytes: int = MAX_DOWNLOAD_BYTES) -> bytes:
+    return b"".join(iter_download(url, max_bytes))
+
+# -------- HTTP 会话：按线程各一个；hedged 查找可中断 ----------
+# requests.Session 不保证线程安全，不在线程间共用：
+#   _http.default 为本线程的复用会话（keep-alive），流水线/多线程模式下每个线程一个；
+#   _http.session 在 hedged_lookup 的工作线程里指向该道菜的 LookupSession
+_http = threading.local()
+
+def thread_session() -> requests.Session:
+    session = getattr(_http, "default", None)
+    if session is None:
+        session = _http.default = requests.Session()
+    return session
+
+def http_get(url: str, **kw):
+    """查找阶段（wiki/bing API）的 GET：在 hedged 工作线程里走可中断的会话，否则走本线程的会话"""
+    session = getattr(_http, "session", None) or thread_session()
+    return session.get(url, **kw)
+
+class LookupSession(requests.Session):
+    """一道菜 hedged 查找共用的会话。cancel() 对它建立的所有连接 shutdown socket，
+    阻塞在读响应上的请求立即以异常返回，线程与（计费的）Bing 请求不会拖到各自超时"""
+
+    def __init__(self):
+        super().__init__()
+        self._conns = []
+        self._lock = threading.Lock()
+        self.cancelled = False
+        session = self
+
+        def tracked(pool_cls):
+            class Conn(pool_cls.ConnectionCls):
+                def connect(self):
+                    super().connect()
+                    session._track(self)
+            return type(f"Tracked{pool_cls.__name__}", (pool_cls,), {"ConnectionCls": Conn})
+
+        pools = {"http": tracked(HTTPConnectionPool), "https": tracked(HTTPSConnectionPool)}
+        for adapter in self.adapters.values():
+            adapter.poolmanager.pool_classes_by_scheme = pools
+
+    def _track(self, conn):
+        with self._lock:
+            self._conns.append(conn)
+            if not self.cancelled:
+                return
+        self._abort(conn)  # 取消后才连上的：立刻断开
+
+    @staticmethod
+    def _abort(conn):
+        sock = getattr(conn, "sock", None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            conns = list(self._conns)
+        for conn in conns:
+            self._abort(conn)
+        self.close()
 
 # -------- Wikipedia APIs ----------
 def api_rest_summary(title: str, lang: str) -> dict | None:
     url = f"https://{lang}.wikipedia.org/api/rest_v1/page/summary/{quote(title)}"
     try:
-        r = requests.get(url, timeout=10, headers=UA)
+        r = http_get(url, timeout=10, headers=UA)
         print(f"  [REST summary {lang}] {title} -> {r.status_code}")
         if r.status_code == 200:
             return r.json()
@@ -111,7 +268,7 @@ def api_rest_summary(title: str, lang: str) -> dict | None:
 def api_rest_media_list(title: str, lang: str) -> dict | None:
     url = f"https://{lang}.wikipedia.org/api/rest_v1/page/media-list/{quote(title)}"
     try:
-        r = requests.get(url, timeout=10, headers=UA)
+        r = http_get(url, timeout=10, headers=UA)
         print(f"  [REST media   {lang}] {title} -> {r.status_code}")
         if r.status_code == 200:
             return r.json()
@@ -123,10 +280,10 @@ def api_action_pageimages(title: str, lang: str) -> dict | None:
     url = (
         f"https://{lang}.wikipedia.org/w/api.php"
         f"?action=query&prop=pageimages|info&inprop=url&format=json"
-        f"&pithumbsize=1200&piprop=original|thumbnail&redirects=1&titles={quote(title)}"
+        f"&pithumbsize={THUMB_WIDTH}&piprop=original|thumbnail&redirects=1&titles={quote(title)}"
     )
     try:
-        r = requests.get(url, timeout=10, headers=UA)
+        r = http_get(url, timeout=10, headers=UA)
         print(f"  [Action API   {lang}] {title} -> {r.status_code}")
         if r.status_code == 200:
             return r.json()
@@ -135,12 +292,14 @@ def api_action_pageimages(title: str, lang: str) -> dict | None:
     return None
 
 def from_summary(j: dict) -> str | None:
+    # 用原图地址+原图宽度改写成目标宽度的缩略图
     for k in ("originalimage", "thumbnail"):
         v = j.get(k, {})
         if isinstance(v, dict):
             u = v.get("source")
             if isinstance(u, str) and u:
-                return u
+                w = v.get("width") if k == "originalimage" else None
+                return sized_wiki_url(u, w if isinstance(w, int) else None)
     return None
 
 def from_media_list(j: dict) -> str | None:
@@ -148,61 +307,107 @@ def from_media_list(j: dict) -> str | None:
     for it in items:
         if it.get("type") == "image":
             srcset = it.get("srcset") or it.get("sources") or []
+            # srcset 已是缩略图（宽度未知，不改写），取最大的一档
             if isinstance(srcset, list) and srcset:
                 last = srcset[-1]
                 if isinstance(last, dict) and isinstance(last.get("src"), str):
-                    return last["src"]
+                    return sized_wiki_url(last["src"])
             if isinstance(it.get("src"), str):
-                return it["src"]
+                return sized_wiki_url(it["src"])
     return None
 
 def from_action_pageimages(j: dict) -> str | None:
     q = j.get("query", {})
     pages = q.get("pages", {})
     for _, page in pages.items():
-        if "original" in page and isinstance(page["original"].get("source"), str):
-            return page["original"]["source"]
+        # thumbnail 已按 pithumbsize 给出（原图更小时 API 自动返回原尺寸）
         if "thumbnail" in page and isinstance(page["thumbnail"].get("source"), str):
             return page["thumbnail"]["source"]
+        if "original" in page and isinstance(page["original"].get("source"), str):
+            return sized_wiki_url(page["original"]["source"], page["original"].get("width"))
     return None
 
-def get_image_from_wiki(name: str):
-    """尝试从 Wikipedia 获取，返回 (url, 'wiki', meta_str) 或 (None, None, None)"""
+def _wiki_try(api, parse, title: str, lang: str):
+    j = api(title, lang)
+    url = parse(j) if j else None
+    return (url, "wiki", f"{lang}:{title}") if url else None
+
+def wiki_titles(name: str) -> list:
+    """按优先级排列的 Wikipedia 标题：[(标题, 语言)]；ALT_TITLES 一律查 en。
+    prefetch_image_urls.py 也用它，两边查的是同一个 wiki"""
     tries = [(name, "zh"), (f"{name}（菜肴）", "zh"), (f"{name}(菜肴)", "zh")]
     for alt in ALT_TITLES.get(name, []):
         tries.append((alt, "en"))
     tries.append((name, "en"))
+    return tries
+
+def wiki_candidates(name: str) -> list:
+    """按优先级排列的 Wikipedia 查询：[(标签, 无参函数)]，函数命中返回 (url, 'wiki', meta)，否则 None"""
+    out = []
+    for title, lang in wiki_titles(name):
+        for kind, api, parse in (("summary", api_rest_summary, from_summary),
+                                 ("media", api_rest_media_list, from_media_list),
+                                 ("action", api_action_pageimages, from_action_pageimages)):
+            out.append((f"wiki {kind} {lang}:{title}",
+                        lambda api=api, parse=parse, title=title, lang=lang: _wiki_try(api, parse, title, lang)))
+    return out
 
-    for title, lang in tries:
-        # summary
-        j = api_rest_summary(title, lang)
-        url = from_summary(j) if j else None
-        if url:
-            print(f"  -> FOUND [{lang}] {title} : {url}")
-            return url, "wiki", f"{lang}:{title}"
-        # media list
-        j = api_rest_media_list(title, lang)
-        url = from_media_list(j) if j else None
-        if url:
-            print(f"  -> FOUND [{lang}] {title} : {url}")
-            return url, "wiki", f"{lang}:{title}"
-        # action api
-        j = api_action_pageimages(title, lang)
-        url = from_action_pageimages(j) if j else None
-        if url:
-            print(f"  -> FOUND [{lang}] {title} : {url}")
-            return url, "wiki", f"{lang}:{title}"
+def get_image_from_wiki(name: str):
+    """尝试从 Wikipedia 获取，返回 (url, 'wiki', meta_str) 或 (None, None, None)"""
+    for _, fn in wiki_candidates(name):
+        hit = fn()
+        if hit:
+            print(f"  -> FOUND [{hit[2]}] : {hit[0]}")
+            return hit
     print("  -> not found via Wikipedia")
     return None, None, None
 
 # -------- Bing Image Search ----------
-def get_image_from_bing(name: str):
-    """使用 Bing Image Search API。需要 BING_IMAGE_API_KEY。
-    返回 (url, 'bing', query) 或 (None, None, None)
-    """
-    if not BING_KEY:
-        return None, None, None
+def _bing_query(q: str):
     headers = {"Ocp-Apim-Subscription-Key": BING_KEY, **UA}
+    try:
+        params = {
+            "q": q,
+            "mkt": BING_MKT,
+            "safeSearch": BING_SAFE,
+            "imageType": "Photo",
+            "count": 30,
+            "license": BING_LICENSE,
+        }
+        r = http_get(BING_ENDPOINT, headers=headers, params=params, timeout=10)
+        print(f"  [Bing] {q} -> {r.status_code}")
+        if r.status_code != 200:
+            return None
+        data = r.json()
+        values = data.get("value", [])
+        # 选择分辨率较高且 url 可用的
+        best = None
+        best_score = -1
+        for v in values:
+            url = v.get("contentUrl") or v.get("hostPageUrl")
+            if not isinstance(url, str) or not url:
+                continue
+            # contentSize 形如 "123456 B"；超过上限的不要
+            size = str(v.get("contentSize") or "").split(" ")[0]
+            if size.isdigit() and int(size) > MAX_DOWNLOAD_BYTES:
+                continue
+            width = v.get("width") or 0
+            height = v.get("height") or 0
+            # 分辨率超过目标宽度不再加分：够用即可，优先小文件
+            score = min(width or 0, THUMB_WIDTH) * (height or 0)
+            if score > best_score:
+                best_score = score
+                best = url
+        if best:
+            return best, "bing", q
+    except Exception as e:
+        print(f"  [Bing err] {q} : {e}")
+    return None
+
+def bing_candidates(name: str) -> list:
+    """按优先级排列的 Bing 查询（未配置 BING_IMAGE_API_KEY 时为空）"""
+    if not BING_KEY:
+        return []
     # 尝试多个查询
     queries = [
         f"{name} 美食",
@@ -211,158 +416,539 @@ def get_image_from_bing(name: str):
         f"{name} dish",
         f"{name} Chinese food",
     ]
-    for q in queries:
-        try:
-            params = {
-                "q": q,
-                "mkt": BING_MKT,
-                "safeSearch": BING_SAFE,
-                "imageType": "Photo",
-                "count": 30,
-                "license": BING_LICENSE,
-            }
-            r = requests.get(BING_ENDPOINT, headers=headers, params=params, timeout=10)
-            print(f"  [Bing] {q} -> {r.status_code}")
-            if r.status_code != 200:
-                continue
-            data = r.json()
-            values = data.get("value", [])
-            # 选择分辨率较高且 url 可用的
-            best = None
-            best_score = -1
-            for v in values:
-                url = v.get("contentUrl") or v.get("hostPageUrl")
-                if not isinstance(url, str) or not url:
-                    continue
-                width = v.get("width") or 0
-                height = v.get("height") or 0
-                score = (width or 0) * (height or 0)
-                if score > best_score:
-                    best_score = score
-                    best = url
-            if best:
-                print(f"  -> FOUND [bing] {q} : {best}")
-                return best, "bing", q
-        except Exception as e:
-            print(f"  [Bing err] {q} : {e}")
+    return [(f"bing {q}", lambda q=q: _bing_query(q)) for q in queries]
+
+def get_image_from_bing(name: str):
+    """使用 Bing Image Search API。需要 BING_IMAGE_API_KEY。
+    返回 (url, 'bing', query) 或 (None, None, None)
+    """
+    if not BING_KEY:
+        return None, None, None
+    for _, fn in bing_candidates(name):
+        hit = fn()
+        if hit:
+            print(f"  -> FOUND [bing] {hit[2]} : {hit[0]}")
+            return hit
     print("  -> not found via Bing")
     return None, None, None
 
 # -------- 汇总逻辑 ----------
-def load_names() -> set[str]:
-    names: set[str] = set()
-    # seed_names.txt
-    if os.path.exists(NAMES_FILE):
-        with open(NAMES_FILE, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#"):
-                    names.add(line)
-    # seed_more.json
+def load_seed_image_urls() -> dict:
+    """seed_more.json 中 菜名 -> image_url（可能为空串），用于排优先级"""
+    out = {}
     if os.path.exists(SEED_MORE):
         try:
-            arr = json.load(open(SEED_MORE, "r", encoding="utf-8"))
-            for item in arr:
+            for item in json.load(open(SEED_MORE, "r", encoding="utf-8")):
                 nm = str(item.get("name", "")).strip()
                 if nm:
-                    names.add(nm)
+                    out[nm] = out.get(nm) or str(item.get("image_url") or "")
         except Exception:
             pass
-    # lists/*.txt
-    if os.path.isdir(LISTS_DIR):
-        for fn in os.listdir(LISTS_DIR):
-            if not fn.endswith(".txt"): continue
-            try:
-                with open(os.path.join(LISTS_DIR, fn), "r", encoding="utf-8") as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith("#"):
-                            names.add(line)
-            except Exception:
-                pass
-    return names
+    return out
 
-def main():
-    names = sorted(load_names())
-    if not names:
-        print("No names found; nothing to do.")
-        return 0
+def priority(name: str, seed_urls: dict) -> tuple:
+    """越小越先抓：完全没有图（连远程 image_url 都没有）> seed_more.json 中的 > 只出现在清单里的"""
+    return (1 if seed_urls.get(name) else 0, 0 if name in seed_urls else 1, name)
 
-    # 读取现有映射
-    mapping = {}
-    if os.path.exists(MAP_FILE):
+def load_state(path: str = STATE_FILE) -> dict:
+    if os.path.exists(path):
         try:
-            mapping = json.load(open(MAP_FILE, "r", encoding="utf-8"))
+            return json.load(open(path, "r", encoding="utf-8"))
         except Exception:
-            mapping = {}
-
-    success_rows = []  # name,status,source,meta/url,asset_path,""
-    fail_rows = []     # name,status,source,meta/url,"",error
-    changed = False
-
-    for name in names:
-        print(f"[dish] {name}")
-        # 已有且文件存在 -> 跳过
-        if name in mapping and os.path.exists(os.path.join(ROOT, mapping[name])):
-            print(f"  -> skip existing: {mapping[name]}")
-            success_rows.append([name, "exists", "cache", "", mapping[name], ""])
-            continue
-
-        # 先 wiki
-        url, source, meta = get_image_from_wiki(name)
-        # 再 bing
-        if not url:
-            url, source, meta = get_image_from_bing(name)
-
-        if not url:
-            msg = "no image from wiki/bing"
-            print(f"  [warn] {msg}: {name}")
-            fail_rows.append([name, "not_found", "none", "", "", msg])
-            continue
-
-        ext = ext_from_url(url)
-        fname = slugify(name) + ext
-        out_path = os.path.join(IMG_DIR, fname)
-        rel_path = f"assets/images/{fname}"
-
-        try:
-            print(f"  [download] ({source}) {url} -> {rel_path}")
-            download(url, out_path)
-            mapping[name] = rel_path
-            success_rows.append([name, "downloaded", source, meta or url, rel_path, ""])
-            changed = True
-            time.sleep(0.25)
-        except Exception as e:
-            msg = f"download_failed: {e}"
-            print(f"  [err] {msg}")
-            fail_rows.append([name, "download_failed", source or "", meta or url or "", "", str(e)])
-
-    # 写映射
-    with open(MAP_FILE, "w", encoding="utf-8") as f:
-        json.dump(mapping, f, ensure_ascii=False, indent=2)
-    print(f"[done] mapping saved: {MAP_FILE}, size={len(mapping)}")
-
+            pass
+    return {}
+
+def shard_of(name: str, total: int) -> int:
+    """稳定哈希分片（与 PYTHONHASHSEED、机器无关）"""
+    return int.from_bytes(hashlib.sha1(name.encode("utf-8")).digest()[:8], "big") % total
+
+def parse_shard(spec: str) -> tuple[int, int]:
+    """'i/N' -> (i, N)，i 从 0 开始"""
+    m = re.fullmatch(r"(\d+)/(\d+)", spec.strip())
+    if not m or not (0 <= int(m.group(1)) < int(m.group(2))):
+        raise argparse.ArgumentTypeError(f"bad shard {spec!r}, expected i/N with 0 <= i < N")
+    return int(m.group(1)), int(m.group(2))
+
+def output_paths(shard: tuple[int, int] | None) -> dict:
+    """映射/报告/状态文件路径；分片运行时各写各的部分文件，最后由 merge_fetch_shards.py 合并"""
+    if shard is None:
+        return {"map": MAP_FILE, "state": STATE_FILE, "csv": REPORT_CSV, "md": REPORT_MD,
+                "latency": LATENCY_CSV, "ledger": LEDGER_DB}
+    tag = f".shard-{shard[0]}-of-{shard[1]}"
+    return {
+        "map": os.path.join(REC_DIR, f"images{tag}.json"),
+        "state": os.path.join(REC_DIR, f"fetch_state{tag}.json"),
+        "csv": os.path.join(REC_DIR, f"fetch_report{tag}.csv"),
+        "md": os.path.join(REC_DIR, f"fetch_report{tag}.md"),
+        "latency": os.path.join(REC_DIR, f"fetch_latency{tag}.csv"),
+        "ledger": os.path.join(REC_DIR, f"fetch_ledger{tag}.db"),  # 只含本分片新增的尝试
+    }
+
+def atomic_dump_json(path: str, obj):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+def write_reports(names: list, success_rows: list, fail_rows: list, pending: int = 0,
+                  csv_path: str = REPORT_CSV, md_path: str = REPORT_MD,
+                  backoff_rows: list = (), ledger: Ledger | None = None):
     # 写 CSV
-    with open(REPORT_CSV, "w", encoding="utf-8", newline="") as f:
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
         w = csv.writer(f)
         w.writerow(["name","status","source","meta_or_query","asset_path","error"])
-        for r in success_rows + fail_rows:
+        for r in success_rows + fail_rows + list(backoff_rows):
             w.writerow(r)
 
     # 写 Markdown 摘要
-    with open(REPORT_MD, "w", encoding="utf-8") as f:
+    with open(md_path, "w", encoding="utf-8") as f:
         f.write(f"# 抓取报告\n\n")
         f.write(f"- 总计菜名：{len(names)}\n")
         f.write(f"- 成功（含已存在）：{len(success_rows)}\n")
-        f.write(f"- 失败：{len(fail_rows)}\n\n")
+        f.write(f"- 失败：{len(fail_rows)}\n")
+        if backoff_rows:
+            f.write(f"- 退避跳过（近期连续失败）：{len(backoff_rows)}\n")
+        if pending:
+            f.write(f"- 未处理（预算用尽，下次续跑）：{pending}\n")
+        f.write("\n")
         if fail_rows:
           f.write("## 未成功的菜名（节选）\n\n")
           for r in fail_rows[:100]:
             f.write(f"- {r[0]} · {r[1]}\n")
           f.write("\n")
+        if ledger is not None:
+            f.write(ledger.trend_markdown(names))
+
+class FetchRun:
+    """一次抓取运行的共享状态：映射、报告行、时间/数量预算、定期断点。
+    顺序模式与流水线模式共用；方法均加锁，可在多个线程中调用。"""
+
+    def __init__(self, names: list, mapping: dict, attempted: set, todo: int,
+                 max_seconds: float | None = None, max_dishes: int | None = None,
+                 checkpoint_every: int = 20, checkpoint_seconds: float = 60.0,
+                 paths: dict | None = None, hedge_width: int = 0,
+                 ledger: Ledger | None = None, strategy: str = "sequential"):
+        self.names = names          # 本次负责的菜名（分片时只含本分片）
+        self.mapping = mapping      # 完整映射；分片时只写出 names 对应的部分
+        self.paths = paths or output_paths(None)
+        self.partial = paths is not None
+        self.attempted = attempted  # 本轮已尝试过（含失败）的菜名，断点续跑时跳过
+        self.todo = todo
+        self.success_rows = []      # name,status,source,meta/url,asset_path,""
+        self.fail_rows = []         # name,status,source,meta/url,"",error
+        self.backoff_rows = []      # name,"backoff","","","",下次可重试日期
+        self.max_seconds = max_seconds
+        self.max_dishes = max_dishes
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_seconds = checkpoint_seconds
+        self.hedge_width = hedge_width  # >0 时用 hedged_lookup
+        self.latency = {}               # 菜名 -> hedged_lookup 的耗时统计
+        self.ledger = ledger            # 每道菜的结果追加一行尝试记录
+        self.strategy = strategy
+        self._begun = {}                # 菜名 -> 开始处理的时刻
+        self.lock = threading.RLock()
+        self.t0 = time.monotonic()
+        self.started = 0
+        self.done = 0
+        self._since_ckpt = 0
+        self._last_ckpt = self.t0
+
+    def take(self) -> bool:
+        """领取一道菜的名额；时间或数量预算用尽时返回 False"""
+        with self.lock:
+            if self.max_dishes is not None and self.started >= self.max_dishes:
+                return False
+            if self.max_seconds is not None and time.monotonic() - self.t0 >= self.max_seconds:
+                return False
+            self.started += 1
+            return True
+
+    def begin(self, name: str):
+        with self.lock:
+            self._begun[name] = time.monotonic()
+
+    def success(self, name: str, row: list, rel_path: str):
+        with self.lock:
+            self.mapping[name] = rel_path
+            self.success_rows.append(row)
+            self._finish(name, row)
+
+    def record_latency(self, name: str, stats: dict):
+        with self.lock:
+            self.latency[name] = stats
+        print(f"  [hedged] {name}: {stats['wall']:.2f}s vs ~{stats['sequential']:.2f}s sequential "
+              f"(saved {stats['sequential'] - stats['wall']:.2f}s, {stats['requests']} requests, "
+              f"winner={stats['winner'] or '-'})")
+
+    def fail(self, name: str, row: list):
+        with self.lock:
+            self.fail_rows.append(row)
+            self._finish(name, row)
+
+    def _finish(self, name: str, row: list):
+        self.attempted.add(name)
+        if self.ledger is not None:
+            t0 = self._begun.pop(name, None)
+            self.ledger.record(name, self.strategy, row[1], source=row[2], meta=row[3], error=row[5],
+                               latency_ms=round((time.monotonic() - t0) * 1000) if t0 is not None else None)
+        self.done += 1
+        self._since_ckpt += 1
+        if (self._since_ckpt >= self.checkpoint_every
+                or time.monotonic() - self._last_ckpt >= self.checkpoint_seconds):
+            self.checkpoint()
+
+    def checkpoint(self):
+        """原子写映射与续跑状态，并刷新报告；中途被杀也不丢已完成的进度"""
+        with self.lock:
+            if self.partial:
+                out = {n: self.mapping[n] for n in self.names if n in self.mapping}
+            else:
+                out = self.mapping
+            atomic_dump_json(self.paths["map"], out)
+            atomic_dump_json(self.paths["state"], {"attempted": sorted(self.attempted)})
+            write_reports(self.names, self.success_rows, self.fail_rows, self.todo - self.done,
+                          self.paths["csv"], self.paths["md"], self.backoff_rows, self.ledger)
+            if self.latency:
+                self.write_latency()
+            self._since_ckpt = 0
+            self._last_ckpt = time.monotonic()
+            print(f"[checkpoint] {self.done}/{self.todo} dishes, ok={len(self.success_rows)}, "
+                  f"fail={len(self.fail_rows)}, elapsed={time.monotonic() - self.t0:.0f}s")
+
+    def write_latency(self):
+        with open(self.paths["latency"], "w", encoding="utf-8", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["name", "winner", "wall_s", "sequential_s", "saved_s", "requests"])
+            for n in sorted(self.latency):
+                st = self.latency[n]
+                w.writerow([n, st["winner"], f"{st['wall']:.3f}", f"{st['sequential']:.3f}",
+                            f"{st['sequential'] - st['wall']:.3f}", st["requests"]])
+
+    def latency_summary(self) -> str:
+        with self.lock:
+            stats = list(self.latency.values())
+        if not stats:
+            return ""
+        saved = sorted(st["sequential"] - st["wall"] for st in stats)
+        wall = sum(st["wall"] for st in stats)
+        seq = sum(st["sequential"] for st in stats)
+        return (f"[hedged] {len(stats)} dishes: lookup {wall:.1f}s vs ~{seq:.1f}s sequential, "
+                f"median saved {saved[len(saved) // 2]:.2f}s/dish, max {saved[-1]:.2f}s")
+
+def hedged_lookup(name: str, width: int = 4, bing_delay: float | None = HEDGE_BING_DELAY):
+    """wiki 候选按优先级并发发出，最多 width 个在途；bing（计费）默认在全部 wiki 候选失败后才发出，
+    与顺序模式一样 wiki 命中的菜不产生 bing 请求；bing_delay 为秒数时，查找开始这么久仍未定下也提前发出。
+    结果按 wiki_candidates + bing_candidates 的优先级决定：排在前面的候选全部失败后，
+    才采用第一个命中的，因此与顺序模式结果一致。定下结果后置位 cancel：
+    尚未开始的候选直接跳过；已在途的请求都走这道菜的 LookupSession，session.cancel() 断开其连接，
+    请求立即失败返回，工作线程随之结束。
+    返回 ((url, source, meta) 或 (None, None, None), 耗时统计)"""
+    wiki, bing = wiki_candidates(name), bing_candidates(name)
+    ranked = wiki + bing  # 优先级
+
+    cancel = threading.Event()
+    session = LookupSession()
+
+    def attempt(rank: int):
+        if cancel.is_set():
+            return None, 0.0
+        t0 = time.perf_counter()
+        _http.session = session
+        try:
+            hit = ranked[rank][1]()
+        except Exception as e:
+            if not cancel.is_set():
+                print(f"  [err] {ranked[rank][0]}: {e}")
+            hit = None
+        finally:
+            _http.session = None
+        return hit, time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    done: dict[int, tuple] = {}
+    winner, nxt = None, 0
+    ex = ThreadPoolExecutor(max_workers=max(1, width))
+    futures = {ex.submit(attempt, rank): rank for rank in range(len(wiki))}
+    pending = set(futures)
+    bing_started = not bing
+    try:
+        while winner is None and nxt < len(ranked):
+            # wiki 全部失败，或等满 bing_delay：发出 bing 候选
+            if not bing_started and (nxt >= len(wiki) or (
+                    bing_delay is not None and time.perf_counter() - t0 >= bing_delay)):
+                for rank in range(len(wiki), len(ranked)):
+                    fut = ex.submit(attempt, rank)
+                    futures[fut] = rank
+                    pending.add(fut)
+                bing_started = True
+            timeout = None
+            if not bing_started and bing_delay is not None:
+                timeout = max(0.0, bing_delay - (time.perf_counter() - t0))
+            finished, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                done[futures[fut]] = fut.result()
+            # 按优先级推进：直到遇到还没完成的候选或第一个命中
+            while nxt in done and winner is None:
+                if done[nxt][0]:
+                    winner = nxt
+                else:
+                    nxt += 1
+    finally:
+        cancel.set()
+        session.cancel()
+        ex.shutdown(wait=False, cancel_futures=True)
+
+    last = winner if winner is not None else len(ranked) - 1
+    stats = {
+        "wall": time.perf_counter() - t0,
+        # 顺序模式会依次执行优先级 <= 胜出者的全部候选；这些候选此时都已完成
+        "sequential": sum(d for r, (_, d) in done.items() if r <= last),
+        "requests": sum(1 for _, d in done.values() if d > 0),
+        "winner": ranked[winner][0] if winner is not None else "",
+    }
+    hit = done[winner][0] if winner is not None else (None, None, None)
+    if winner is not None:
+        print(f"  -> FOUND [{hit[1]}] {hit[2]} : {hit[0]}")
+    return hit, stats
+
+def lookup(name: str, run: FetchRun | None = None):
+    """先 wiki 再 bing，返回 (url, source, meta) 或 (None, None, None)；
+    run.hedge_width > 0 时并发查找并记录耗时"""
+    if run is not None and run.hedge_width > 0:
+        hit, stats = hedged_lookup(name, run.hedge_width)
+        run.record_latency(name, stats)
+        return hit
+    url, source, meta = get_image_from_wiki(name)
+    if not url:
+        url, source, meta = get_image_from_bing(name)
+    return url, source, meta
+
+def fetch_one(name: str, run: FetchRun):
+    """顺序模式：查找 -> 原样下载到 assets/images（由 optimize-images 再转 WebP）"""
+    url, source, meta = lookup(name, run)
+    if not url:
+        msg = "no image from wiki/bing"
+        print(f"  [warn] {msg}: {name}")
+        run.fail(name, [name, "not_found", "none", "", "", msg])
+        return
+
+    ext = ext_from_url(url)
+    fname = slugify(name) + ext
+    out_path = os.path.join(IMG_DIR, fname)
+    rel_path = f"assets/images/{fname}"
 
-    print(f"[report] {REPORT_MD}")
-    print(f"[report] {REPORT_CSV}")
+    try:
+        print(f"  [download] ({source}) {url} -> {rel_path}")
+        got = download(url, out_path)
+        print(f"  [download] {got} bytes")
+        run.success(name, [name, "downloaded", source, meta or url, rel_path, ""], rel_path)
+        time.sleep(0.25)
+    except Exception as e:
+        msg = f"download_failed: {e}"
+        print(f"  [err] {msg}")
+        run.fail(name, [name, "download_failed", source or "", meta or url or "", "", str(e)])
+
+# -------- 流水线模式：下载 -> 内存解码/缩放/WebP 编码 -> 只写最终文件 ----------
+WEBP_QUALITY = 80  # 与 optimize-images.yml 的 cwebp -q 80 -m 6 一致
+WEBP_METHOD = 6
+
+def transcode_webp(data: bytes) -> bytes:
+    """在内存中解码、按最长边 THUMB_WIDTH 等比缩小（不放大）、编码为 WebP"""
+    with Image.open(io.BytesIO(data)) as src:
+        src.draft("RGB", (THUMB_WIDTH, THUMB_WIDTH))  # JPEG 直接按比例解码，省内存
+        im = ImageOps.exif_transpose(src)
+        alpha = im.mode in ("RGBA", "LA") or (im.mode == "P" and "transparency" in im.info)
+        im = im.convert("RGBA" if alpha else "RGB")
+        im.thumbnail((THUMB_WIDTH, THUMB_WIDTH))
+        buf = io.BytesIO()
+        im.save(buf, format="WEBP", quality=WEBP_QUALITY, method=WEBP_METHOD)
+        return buf.getvalue()
+
+def run_pipeline(names: list, run: FetchRun, fetch_workers: int, transcode_workers: int, queue_size: int):
+    """网络阶段（查找+下载）与 CPU 阶段（转码）通过有界队列重叠执行。
+    队列满时下载线程阻塞，避免内存里堆积过多原图。"""
+    q: queue.Queue = queue.Queue(maxsize=queue_size)
+    lock = threading.Lock()
+    busy = {"fetch": 0.0, "transcode": 0.0}
+
+    def fetch_stage(name: str):
+        if not run.take():
+            return
+        run.begin(name)
+        t0 = time.perf_counter()
+        try:
+            try:
+                url, source, meta = lookup(name, run)
+            except Exception as e:
+                url, source, meta = None, None, None
+                print(f"  [err] lookup_failed: {name}: {e}")
+            if not url:
+                print(f"  [warn] no image from wiki/bing: {name}")
+                run.fail(name, [name, "not_found", "none", "", "", "no image from wiki/bing"])
+                return
+            try:
+                data = fetch_bytes(url)
+            except Exception as e:
+                print(f"  [err] download_failed: {name}: {e}")
+                run.fail(name, [name, "download_failed", source or "", meta or url, "", str(e)])
+                return
+            print(f"  [fetched] {name} ({source}) {len(data)} bytes")
+        finally:
+            with lock:
+                busy["fetch"] += time.perf_counter() - t0
+        q.put((name, data, source, meta or url))
+
+    def transcode_stage():
+        while True:
+            job = q.get()
+            if job is None:
+                return
+            name, data, source, meta = job
+            t0 = time.perf_counter()
+            fname = slugify(name) + ".webp"
+            rel_path = f"assets/images/{fname}"
+            out_path = os.path.join(IMG_DIR, fname)
+            try:
+                webp = transcode_webp(data)
+                tmp = out_path + ".part"
+                with open(tmp, "wb") as f:
+                    f.write(webp)
+                os.replace(tmp, out_path)
+                print(f"  [webp] {name}: {len(data)} -> {len(webp)} bytes -> {rel_path}")
+                run.success(name, [name, "downloaded", source, meta, rel_path, ""], rel_path)
+            except Exception as e:
+                print(f"  [err] transcode_failed: {name}: {e}")
+                run.fail(name, [name, "transcode_failed", source, meta, "", str(e)])
+            finally:
+                with lock:
+                    busy["transcode"] += time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    workers = [threading.Thread(target=transcode_stage, daemon=True) for _ in range(transcode_workers)]
+    for t in workers:
+        t.start()
+    with ThreadPoolExecutor(max_workers=fetch_workers) as ex:
+        list(ex.map(fetch_stage, names))
+    for _ in workers:
+        q.put(None)
+    for t in workers:
+        t.join()
+    wall = time.perf_counter() - t0
+    print(f"[pipeline] dishes={run.done} wall={wall:.1f}s "
+          f"fetch_busy={busy['fetch']:.1f}s transcode_busy={busy['transcode']:.1f}s")
+
+def main():
+    ap = argparse.ArgumentParser(description="Fetch dish images from Wikipedia/Bing into assets/images.")
+    ap.add_argument("--pipeline", action="store_true",
+                    help="download and transcode to WebP in memory (needs Pillow); only the final .webp is written")
+    ap.add_argument("--fetch-workers", type=int, default=4, help="pipeline: concurrent lookups/downloads")
+    ap.add_argument("--transcode-workers", type=int, default=os.cpu_count() or 2,
+                    help="pipeline: concurrent WebP encoders")
+    ap.add_argument("--queue-size", type=int, default=8, help="pipeline: max downloaded images waiting for encoding")
+    ap.add_argument("--max-seconds", type=float, default=None,
+                    help="stop starting new dishes after this many seconds; the next run resumes")
+    ap.add_argument("--max-dishes", type=int, default=None, help="process at most this many dishes in this run")
+    ap.add_argument("--checkpoint-every", type=int, default=20,
+                    help="save mapping/state/report every N finished dishes")
+    ap.add_argument("--checkpoint-seconds", type=float, default=60.0,
+                    help="... or at least this often (seconds)")
+    ap.add_argument("--hedged", action="store_true",
+                    help="race wiki/bing lookup candidates concurrently; same result as sequential priority")
+    ap.add_argument("--hedge-width", type=int, default=4,
+                    help="hedged: max in-flight lookup requests per dish")
+    ap.add_argument("--shard", type=parse_shard, default=None, metavar="i/N",
+                    help="only fetch names whose stable hash falls in shard i of N (0-based); "
+                         "writes images.shard-i-of-N.json etc. for merge_fetch_shards.py")
+    ap.add_argument("--force", action="store_true",
+                    help="ignore the failure backoff in fetch_ledger.db and retry every missing dish")
+    args = ap.parse_args()
+    if args.pipeline and Image is None:
+        print("--pipeline requires Pillow: pip install pillow")
+        return 2
+
+    names = sorted(load_names())
+    if args.shard:
+        i, n = args.shard
+        names = [nm for nm in names if shard_of(nm, n) == i]
+        print(f"[shard] {i}/{n}: {len(names)} names")
+    if not names:
+        print("No names found; nothing to do.")
+        return 0
+    paths = output_paths(args.shard)
+
+    # 读取现有映射
+    mapping = {}
+    if os.path.exists(MAP_FILE):
+        try:
+            mapping = json.load(open(MAP_FILE, "r", encoding="utf-8"))
+        except Exception:
+            mapping = {}
+
+    exists_rows, missing = [], []
+    for name in names:
+        # 已有且文件存在 -> 跳过
+        cur = entry_path(mapping.get(name))
+        if cur and os.path.exists(os.path.join(ROOT, cur)):
+            exists_rows.append([name, "exists", "cache", "", cur, ""])
+        else:
+            missing.append(name)
+    print(f"[plan] {len(names)} names, {len(exists_rows)} with local images, {len(missing)} missing")
+
+    # 台账：分片时写本分片的库，退避判断同时读主台账
+    ledger = Ledger(paths["ledger"], base=LEDGER_DB)
+    backoff_rows = []
+    if not args.force:
+        waiting = ledger.backoff(missing)
+        if waiting:
+            backoff_rows = [[n, "backoff", "", "", "", "retry after " + time.strftime("%Y-%m-%d", time.localtime(due))]
+                            for n, due in sorted(waiting.items())]
+            missing = [n for n in missing if n not in waiting]
+            print(f"[backoff] skipping {len(waiting)} dishes that failed recently (use --force to retry)")
+
+    # 断点续跑：本轮已尝试过的跳过；全部尝试过一遍后开始新一轮
+    attempted = set(load_state(paths["state"]).get("attempted", [])) & set(missing)
+    todo = [n for n in missing if n not in attempted]
+    if missing and not todo:
+        print("[resume] previous pass finished; starting a new pass")
+        attempted, todo = set(), list(missing)
+    elif attempted:
+        print(f"[resume] skipping {len(attempted)} dishes already tried in this pass")
+
+    seed_urls = load_seed_image_urls()
+    todo.sort(key=lambda n: priority(n, seed_urls))
+
+    run = FetchRun(names, mapping, attempted, len(todo),
+                   max_seconds=args.max_seconds, max_dishes=args.max_dishes,
+                   checkpoint_every=args.checkpoint_every, checkpoint_seconds=args.checkpoint_seconds,
+                   paths=paths if args.shard else None,
+                   hedge_width=args.hedge_width if args.hedged else 0,
+                   ledger=ledger, strategy="hedged" if args.hedged else "sequential")
+    run.success_rows.extend(exists_rows)
+    run.backoff_rows.extend(backoff_rows)
+    shard_tag = f"{args.shard[0]}of{args.shard[1]}" if args.shard else ""
+    ledger.start_run(run.strategy + ("+pipeline" if args.pipeline else ""), shard_tag)
+
+    if args.pipeline:
+        run_pipeline(todo, run, args.fetch_workers, args.transcode_workers, args.queue_size)
+    else:
+        for name in todo:
+            if not run.take():
+                break
+            print(f"[dish] {name}")
+            run.begin(name)
+            fetch_one(name, run)
+
+    if run.done < len(todo):
+        print(f"[budget] stopped after {run.done} dishes; {len(todo) - run.done} left for the next run")
+    run.checkpoint()
+    ledger.close()
+    if run.latency:
+        print(run.latency_summary())
+        print(f"[report] {paths['latency']}")
+    print(f"[done] mapping saved: {paths['map']}, size={len(mapping)}")
+    print(f"[report] {paths['md']}")
+    print(f"[report] {paths['csv']}")
+    print(f"[ledger] {paths['ledger']}")
     return 0
 
 if __name__ == "__main__":
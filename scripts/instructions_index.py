@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按菜名随机读取 / 追加 assets/recipes/instructions/instructions.tsv（偏移索引 + mmap，见 recipe_pipeline/tsv_index.py）。
+
+用法：
+  python scripts/instructions_index.py get 宫保鸡丁 川菜      # 打印一道菜的做法
+  python scripts/instructions_index.py range 100 110          # 打印第 100~109 个数据行
+  python scripts/instructions_index.py patch 宫保鸡丁 川菜    # 按当前模板重新生成并追加（覆盖旧行）；
+                                                              菜系写中文或 key（chuancai），TSV 中统一记中文
+  python scripts/instructions_index.py rebuild                # 强制重建 instructions.tsv.idx
+"""
+import sys, time, argparse
+
+from recipe_pipeline import TSV, CUISINE_ZH, TsvIndex, cuisine_zh, gen_by_style
+
+def main():
+    ap = argparse.ArgumentParser(description="Random access to instructions.tsv through an offset index.")
+    ap.add_argument("--tsv", default=TSV, help="TSV path (default: %(default)s)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    g = sub.add_parser("get", help="print the instructions of one dish")
+    g.add_argument("name")
+    g.add_argument("cuisine")
+    r = sub.add_parser("range", help="print data rows [START, STOP)")
+    r.add_argument("start", type=int)
+    r.add_argument("stop", type=int)
+    p = sub.add_parser("patch", help="regenerate one dish from the templates and append it")
+    p.add_argument("name")
+    p.add_argument("cuisine", help="Chinese cuisine name or key, e.g. 粤菜 or yuecai")
+    sub.add_parser("rebuild", help="rebuild the sidecar index")
+    args = ap.parse_args()
+    if args.cmd == "patch":
+        # 做法模板按中文菜系取默认版，TSV 其余行也记中文；key 不转换会静默落到川菜默认版
+        zh = cuisine_zh(args.cuisine)
+        if zh is None:
+            ap.error(f"unknown cuisine {args.cuisine!r}; use one of "
+                     + ", ".join(f"{v}/{k}" for k, v in CUISINE_ZH.items()))
+        args.cuisine = zh
+
+    t0 = time.perf_counter()
+    idx = TsvIndex(args.tsv)
+    print(f"[index] {len(idx)} rows, {idx.index_path} ({(time.perf_counter() - t0) * 1000:.0f} ms)")
+    with idx:
+        if args.cmd == "get":
+            instr = idx.get(args.name, args.cuisine)
+            if instr is None:
+                print(f"{args.name}（{args.cuisine}）not found.")
+                return 1
+            print(instr)
+        elif args.cmd == "range":
+            for i, (nm, cui, instr) in enumerate(idx.rows(args.start, args.stop), args.start):
+                print(f"{i}\t{nm}\t{cui}\t{instr.splitlines()[0] if instr else ''}")
+        elif args.cmd == "patch":
+            idx.append([(args.name, args.cuisine, gen_by_style(args.name, args.cuisine))])
+            print(f"appended {args.name}（{args.cuisine}）-> {idx.path}")
+        elif args.cmd == "rebuild":
+            print(f"rebuilt: {idx.rebuild()} rows")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
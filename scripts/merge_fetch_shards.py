@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+合并 fetch_wiki_images.py --shard i/N 的分片产物：
+  assets/recipes/images.shard-*-of-N.json       -> assets/recipes/images.json
+  assets/recipes/fetch_report.shard-*-of-N.csv  -> assets/recipes/fetch_report.csv / .md
+  assets/recipes/fetch_latency.shard-*-of-N.csv -> assets/recipes/fetch_latency.csv（--hedged 时才有）
+  assets/recipes/fetch_ledger.shard-*-of-N.db   -> assets/recipes/fetch_ledger.db（追加，按 run_id/菜名/时间去重）
+
+冲突处理（结果与分片到达顺序无关）：
+  - 同一菜名在多个分片中出现（N 改变过、或手工重跑）时：
+    现有 images.json 中文件仍存在的条目优先；否则取文件存在的、分片序号最小的条目；
+    都不存在时取分片序号最小的条目；
+  - 报告中同一菜名成功行优先于失败行，其次取分片序号最小的行；退避跳过的行单独计数；
+  - 输出按菜名排序（images.json 中已有的键保持原有顺序）。
+合并完成后删除分片的映射、报告与台账文件（fetch_state.shard-* 保留，供各分片续跑）。
+"""
+import os, re, csv, sys, glob, json
+
+from fetch_wiki_images import (
+    ROOT, REC_DIR, MAP_FILE, REPORT_CSV, REPORT_MD, LATENCY_CSV,
+    entry_path, atomic_dump_json, write_reports,
+)
+from fetch_ledger import LEDGER_DB, Ledger
+
+_SHARD_RE = re.compile(r"\.shard-(\d+)-of-(\d+)\.(json|csv|md|db)$")
+
+def shard_files(prefix: str, ext: str) -> list:
+    """返回按 (N, i) 排序的 [(i, N, path)]"""
+    out = []
+    for path in glob.glob(os.path.join(REC_DIR, f"{prefix}.shard-*-of-*.{ext}")):
+        m = _SHARD_RE.search(path)
+        if m:
+            out.append((int(m.group(1)), int(m.group(2)), path))
+    return sorted(out, key=lambda t: (t[1], t[0]))
+
+def file_exists(entry) -> bool:
+    p = entry_path(entry)
+    return bool(p) and os.path.exists(os.path.join(ROOT, p))
+
+def merge_mappings(base: dict, partials: list) -> tuple[dict, int]:
+    """partials: [(shard_index, mapping)]（已排序）；返回 (合并结果, 冲突数)"""
+    candidates: dict[str, list] = {}
+    for _, part in partials:
+        for name, entry in part.items():
+            candidates.setdefault(name, []).append(entry)
+
+    merged = dict(base)
+    conflicts = 0
+    for name in sorted(candidates):
+        entries = candidates[name]
+        distinct = {json.dumps(e, sort_keys=True, ensure_ascii=False) for e in entries}
+        if len(distinct) > 1:
+            conflicts += 1
+            print(f"  [conflict] {name}: {len(distinct)} different entries")
+        if name in base and file_exists(base[name]):
+            continue
+        existing = [e for e in entries if file_exists(e)]
+        merged[name] = (existing or entries)[0]
+    return merged, conflicts
+
+def merge_reports(paths: list) -> tuple[list, list]:
+    best: dict[str, list] = {}
+    for _, _, path in paths:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            next(reader, None)  # 表头
+            for row in reader:
+                if not row:
+                    continue
+                old = best.get(row[0])
+                ok = row[1] in ("exists", "downloaded")
+                if old is None or (ok and old[1] not in ("exists", "downloaded")):
+                    best[row[0]] = row
+    success = [best[n] for n in sorted(best) if best[n][1] in ("exists", "downloaded")]
+    fail = [best[n] for n in sorted(best) if best[n][1] not in ("exists", "downloaded")]
+    return success, fail
+
+def merge_latency(paths: list) -> int:
+    """各分片菜名互不重叠，直接按菜名排序拼接"""
+    header, rows = None, {}
+    for _, _, path in paths:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None) or header
+            for row in reader:
+                if row:
+                    rows.setdefault(row[0], row)
+    with open(LATENCY_CSV, "w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        w.writerows(rows[n] for n in sorted(rows))
+    return len(rows)
+
+def main():
+    maps = shard_files("images", "json")
+    reports = shard_files("fetch_report", "csv")
+    if not maps and not reports:
+        print("No shard outputs found; nothing to merge.")
+        return 0
+    totals = {n for _, n, _ in maps + reports}
+    if len(totals) > 1:
+        print(f"[warn] shard outputs from different N: {sorted(totals)}")
+
+    base = {}
+    if os.path.exists(MAP_FILE):
+        with open(MAP_FILE, "r", encoding="utf-8") as f:
+            base = json.load(f)
+    partials = []
+    for i, _, path in maps:
+        with open(path, "r", encoding="utf-8") as f:
+            partials.append((i, json.load(f)))
+    merged, conflicts = merge_mappings(base, partials)
+    atomic_dump_json(MAP_FILE, merged)
+    print(f"[mapping] {len(maps)} shards -> {MAP_FILE}: {len(base)} -> {len(merged)} entries, conflicts={conflicts}")
+
+    ledgers = shard_files("fetch_ledger", "db")
+    ledger = Ledger(LEDGER_DB)
+    added = sum(ledger.merge_into(path) for _, _, path in ledgers)
+    print(f"[ledger] {len(ledgers)} shards -> {LEDGER_DB}: {added} new rows")
+
+    success, fail = merge_reports(reports)
+    backoff = [r for r in fail if r[1] == "backoff"]
+    fail = [r for r in fail if r[1] != "backoff"]
+    names = sorted({r[0] for r in success + fail + backoff})
+    write_reports(names, success, fail, backoff_rows=backoff, ledger=ledger)
+    ledger.close()
+    print(f"[report] {len(reports)} shards -> {REPORT_CSV}, {REPORT_MD}: ok={len(success)} fail={len(fail)} "
+          f"backoff={len(backoff)}")
+
+    latency = shard_files("fetch_latency", "csv")
+    if latency:
+        n = merge_latency(latency)
+        print(f"[latency] {len(latency)} shards -> {LATENCY_CSV}: {n} dishes")
+
+    for _, _, path in maps + reports + shard_files("fetch_report", "md") + latency + ledgers:
+        os.remove(path)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,63 +1,60 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-import os, json, csv, sys
-
-ROOT = os.path.dirname(os.path.dirname(__file__))
-SEED = os.path.join(ROOT, "assets", "recipes", "seed_more.json")
-TSV  = os.path.join(ROOT, "assets", "recipes", "instructions", "instructions.tsv")
-
-CUISINE_MAP = {
-    "川菜":"chuancai","粤菜":"yuecai","苏菜":"sucai","浙菜":"zhecai",
-    "闽菜":"mincai","湘菜":"xiangcai","徽菜":"huicai","鲁菜":"lucai",
-    "自定义":"custom","custom":"custom","chuancai":"chuancai","yuecai":"yuecai",
-    "sucai":"sucai","zhecai":"zhecai","mincai":"mincai","xiangcai":"xiangcai",
-    "huicai":"huicai","lucai":"lucai",
-}
-
-def load_seed():
-    if not os.path.exists(SEED):
-        print("seed_more.json not found, creating new one.")
-        return []
-    with open(SEED, "r", encoding="utf-8") as f:
-        try:
-            data = json.load(f)
-            return data if isinstance(data, list) else []
-        except Exception:
-            return []
-
-def save_seed(arr):
-    with open(SEED, "w", encoding="utf-8") as f:
-        json.dump(arr, f, ensure_ascii=False, indent=2)
+"""
+把做法合并进 assets/recipes/seed_more.json，并重新生成 seed_pack.json 与 search.db。
+  默认读 instructions.tsv；--from-lists 则直接从清单生成做法（同一进程，不经过 TSV）；
+  --dish 菜名[@菜系] 只合并指定的菜，经偏移索引直接读对应行（见 recipe_pipeline/tsv_index.py）。
+合并语义见 recipe_pipeline/merge.py。
+"""
+import sys, argparse
+
+from recipe_pipeline import (
+    TSV, SEED, iter_catalog, generate, read_tsv, load_seed, save_seed, merge_into_seed, write_pack,
+    write_search_db, TsvIndex,
+)
+
+def dish_rows(idx: TsvIndex, specs: list, seed: list) -> list:
+    """'菜名' 或 '菜名@菜系' -> [(菜名, 菜系, 做法)]；没写菜系时取 seed 中同名记录的菜系"""
+    rows = []
+    for spec in specs:
+        name, _, cui = spec.partition("@")
+        cuisines = [cui] if cui else sorted({it.get("cuisine", "") for it in seed if it.get("name") == name})
+        found = [(name, c, idx.get(name, c)) for c in cuisines]
+        found = [r for r in found if r[2] is not None]
+        if not found:
+            print(f"[skip] {spec}: not in instructions.tsv")
+        rows.extend(found)
+    return rows
 
 def main():
-    seed = load_seed()
-    by_key = {(it.get("name",""), it.get("cuisine","")): it for it in seed}
-
-    if not os.path.exists(TSV):
+    ap = argparse.ArgumentParser(description="Merge instructions into seed_more.json.")
+    ap.add_argument("--from-lists", action="store_true",
+                    help="generate instructions from lists in-process instead of reading instructions.tsv")
+    ap.add_argument("--dish", action="append", default=[], metavar="NAME[@CUISINE]",
+                    help="only merge these dishes, looked up through the instructions.tsv offset index")
+    args = ap.parse_args()
+
+    if args.dish:
+        if not TSV.exists():
+            print("instructions.tsv not found.")
+            return 0
+        with TsvIndex() as idx:
+            rows = dish_rows(idx, args.dish, load_seed())
+    elif args.from_lists:
+        rows = generate(iter_catalog())
+    elif TSV.exists():
+        rows = read_tsv()
+    else:
         print("instructions.tsv not found.")
         return 0
 
-    updated, added = 0, 0
-    with open(TSV, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f, delimiter="\t")
-        for row in reader:
-            name = (row.get("name") or "").strip()
-            cuisine_in = (row.get("cuisine") or "").strip()
-            instr = (row.get("instructions") or "").replace("\\n", "\n").strip()
-            if not name or not instr:
-                continue
-            key = CUISINE_MAP.get(cuisine_in, cuisine_in or "custom")
-            obj = by_key.get((name, key))
-            if obj:
-                obj["instructions"] = instr
-                updated += 1
-            else:
-                seed.append({"name": name, "cuisine": key, "instructions": instr})
-                by_key[(name, key)] = seed[-1]
-                added += 1
-
+    seed = load_seed()
+    stats = merge_into_seed(seed, rows)
     save_seed(seed)
-    print(f"done. updated={updated}, added={added}, total={len(seed)}")
+    print(f"done. updated={stats['updated']}, added={stats['added']}, "
+          f"unchanged={stats['unchanged']}, total={len(seed)} -> {SEED}")
+    write_pack(seed)
+    write_search_db(seed)
     return 0
 
 if __name__ == "__main__":
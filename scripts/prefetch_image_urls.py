@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+构建期批量预解析远程缩略图地址，写回 seed_more.json，省掉 App 首次展示时的维基百科请求。
+
+对象：seed_more.json 中 image_url 为空、且没有本地图片的记录。
+“没有本地图片”指：images.json 中无同名条目（或文件不存在），image_resolution.json 也解析不到。
+对每个菜名并发查 Wikipedia REST summary（标题与语言同 fetch_wiki_images.wiki_titles：
+zh 原名/（菜肴） -> ALT_TITLES 别名(en) -> en 原名，命中即止），
+取原图并用 sized_wiki_url 改写为 PREFETCH_WIDTH 宽的缩略图，写入：
+  image_url          缩略图地址（App 导入后直接作为 recipes.image_url 使用）
+  image_source       来源，如 wikipedia:zh:宫保鸡丁
+  image_resolved_at  解析日期（YYYY-MM-DD）
+随后重新生成 seed_pack.json。运行时的维基百科兜底只剩用户自建菜谱会用到。
+
+缓存：.cache/wiki_summary.json（不入库），键为 "lang:标题"：
+  - 有图/无图的结果都缓存，重跑不再请求；无图的结果 NEGATIVE_TTL_DAYS 天后重查；
+  - 网络错误、5xx、429 不缓存，下次重试；--refresh 忽略缓存。
+
+用法：
+  python scripts/prefetch_image_urls.py                 # 默认 8 并发
+  python scripts/prefetch_image_urls.py --workers 16 --width 640
+"""
+import os, sys, json, time, argparse, datetime, threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+import requests
+
+from fetch_wiki_images import (
+    ROOT, REC_DIR, MAP_FILE, UA,
+    entry_path, sized_wiki_url, atomic_dump_json, wiki_titles,
+)
+from recipe_pipeline import load_seed, save_seed, write_pack
+
+RESOLUTION_FILE = os.path.join(REC_DIR, "image_resolution.json")
+CACHE_DIR = os.path.join(ROOT, ".cache")
+CACHE_FILE = os.path.join(CACHE_DIR, "wiki_summary.json")
+
+PREFETCH_WIDTH = int(os.environ.get("PREFETCH_WIDTH", "800"))  # 手机全宽展示足够
+NEGATIVE_TTL_DAYS = 30
+
+def local_names() -> set:
+    """images.json（文件存在）与 image_resolution.json 能解析到的菜名"""
+    names = set()
+    if os.path.exists(MAP_FILE):
+        with open(MAP_FILE, "r", encoding="utf-8") as f:
+            mapping = json.load(f)
+        names = {k for k, v in mapping.items()
+                 if entry_path(v) and os.path.exists(os.path.join(ROOT, entry_path(v)))}
+    if os.path.exists(RESOLUTION_FILE):
+        with open(RESOLUTION_FILE, "r", encoding="utf-8") as f:
+            resolved = json.load(f)
+        names |= {k for k, v in resolved.items() if isinstance(v, dict) and v.get("of") in names}
+    return names
+
+def candidate_titles(name: str) -> list:
+    """[(lang, title)]，按查询顺序；语言选择与抓图脚本一致（wiki_titles）"""
+    seen, uniq = set(), []
+    for t in ((lang, title) for title, lang in wiki_titles(name)):
+        if t not in seen:
+            seen.add(t)
+            uniq.append(t)
+    return uniq
+
+class SummaryCache:
+    def __init__(self, path: str = CACHE_FILE, refresh: bool = False):
+        self.path = path
+        self.lock = threading.Lock()
+        self.data = {}
+        self.hits = 0
+        if not refresh and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+
+    def get(self, key: str) -> dict | None:
+        with self.lock:
+            v = self.data.get(key)
+        if v is None:
+            return None
+        if not v.get("source"):
+            age = time.time() - v.get("ts", 0)
+            if age > NEGATIVE_TTL_DAYS * 86400:
+                return None
+        with self.lock:
+            self.hits += 1
+        return v
+
+    def put(self, key: str, value: dict):
+        with self.lock:
+            self.data[key] = value
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self.lock:
+            atomic_dump_json(self.path, self.data)
+
+def fetch_summary(lang: str, title: str) -> dict | None:
+    """返回可缓存的结果 {title, source, width, ts}（无图时 source 为空）；临时错误返回 None"""
+    url = f"https://{lang}.wikipedia.org/api/rest_v1/page/summary/{quote(title, safe='')}"
+    try:
+        r = requests.get(url, timeout=15, headers=UA)
+    except Exception as e:
+        print(f"  [err] {lang}:{title}: {e}")
+        return None
+    if r.status_code == 404:
+        return {"title": title, "source": "", "width": None, "ts": int(time.time())}
+    if r.status_code != 200:
+        print(f"  [HTTP {r.status_code}] {lang}:{title}")
+        return None
+    try:
+        j = r.json()
+    except ValueError as e:  # 200 但不是 JSON（网关错误页等）：按临时错误处理，下次再查
+        print(f"  [bad json] {lang}:{title}: {e}")
+        return None
+    orig, thumb = j.get("originalimage") or {}, j.get("thumbnail") or {}
+    source, width = (orig.get("source"), orig.get("width")) if orig.get("source") else (thumb.get("source"), None)
+    if j.get("type") == "disambiguation":  # 消歧义页的配图通常不是这道菜
+        source = ""
+    return {"title": j.get("title") or title, "source": source or "", "width": width,
+            "ts": int(time.time())}
+
+def resolve(name: str, cache: SummaryCache, width: int) -> tuple[dict | None, bool]:
+    """返回 (结果, 是否有临时错误)；结果为 {image_url, image_source}"""
+    transient = False
+    for lang, title in candidate_titles(name):
+        key = f"{lang}:{title}"
+        hit = cache.get(key)
+        if hit is None:
+            hit = fetch_summary(lang, title)
+            if hit is None:
+                transient = True
+                continue
+            cache.put(key, hit)
+        if hit["source"]:
+            return {"image_url": sized_wiki_url(hit["source"], hit.get("width"), width),
+                    "image_source": f"wikipedia:{lang}:{hit['title']}"}, transient
+    return None, transient
+
+def main():
+    ap = argparse.ArgumentParser(description="Prefetch remote thumbnail URLs into seed_more.json.")
+    ap.add_argument("--workers", type=int, default=8, help="concurrent lookups")
+    ap.add_argument("--width", type=int, default=PREFETCH_WIDTH, help="thumbnail width in pixels")
+    ap.add_argument("--refresh", action="store_true", help="ignore the summary cache")
+    args = ap.parse_args()
+
+    seed = load_seed()
+    local = local_names()
+    todo = sorted({str(it.get("name", "")).strip() for it in seed
+                   if not it.get("image_url") and str(it.get("name", "")).strip()
+                   and str(it.get("name", "")).strip() not in local})
+    print(f"[plan] seed={len(seed)} need_url={len(todo)} workers={args.workers} width={args.width}")
+    if not todo:
+        return 0
+
+    cache = SummaryCache(refresh=args.refresh)
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as ex:
+        results = dict(zip(todo, ex.map(lambda nm: resolve(nm, cache, args.width), todo)))
+    cache.save()
+
+    today = datetime.date.today().isoformat()
+    updated = 0
+    for it in seed:
+        res, _ = results.get(str(it.get("name", "")).strip(), (None, False))
+        if res and not it.get("image_url"):
+            it.update(res, image_resolved_at=today)
+            updated += 1
+    found = sum(1 for r, _ in results.values() if r)
+    errors = sum(1 for _, e in results.values() if e)
+    print(f"[done] {len(todo)} dishes in {time.perf_counter() - t0:.1f}s: "
+          f"found={found} none={len(todo) - found} transient_errors={errors} "
+          f"cache_hits={cache.hits} -> {updated} seed records")
+    if updated:
+        save_seed(seed)
+        write_pack(seed)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
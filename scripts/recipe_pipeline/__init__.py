@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+菜谱数据流水线：catalog -> instructions -> merge -> seed，各阶段是可在同一进程内串联的生成器，
+不经过中间文件：
+
+    from recipe_pipeline import build
+    build()                      # 清单 -> 做法 -> 合并进 seed_more.json -> seed_pack.json、search.db
+    build(tsv=True)              # 同时导出 instructions.tsv（可选）
+
+也可以手动组合：
+    rows = generate(iter_catalog())
+    seed = load_seed(); merge_into_seed(seed, rows); save_seed(seed); write_pack(seed); write_search_db(seed)
+
+按菜名随机读取/追加 instructions.tsv（旁路偏移索引 + mmap）：
+    with TsvIndex() as idx: idx.get("宫保鸡丁", "川菜")
+
+命令行：PYTHONPATH=scripts python -m recipe_pipeline [--tsv]
+scripts/ 下的 generate_instructions_tsv.py、merge_instructions_into_seed.py、build_seed_json.py
+只是本包的薄封装。
+"""
+from pathlib import Path
+
+from .paths import ROOT, REC_DIR, LIST_DIR, TSV, SEED, PACK
+from .catalog import (
+    CUISINE_BY_FILE, CUISINE_MAP, CUISINE_ZH, cuisine_key, cuisine_zh, read_list, iter_catalog, load_names,
+)
+from .instructions import gen_by_style, generate, esc, unesc, tee_tsv, write_tsv, read_tsv
+from .merge import load_seed, save_seed, merge_rows, merge_into_seed
+from .seed import (
+    default_steps, default_entries, load_image_fields,
+    intern_instructions, expand_instructions, write_pack,
+)
+from .search import SEARCH_DB, write_search_db
+from .tsv_index import TsvIndex
+
+def build(list_dir: Path = LIST_DIR, seed_path: Path = SEED, pack_path: Path = PACK,
+          search_path: Path = SEARCH_DB, tsv: bool | Path = False) -> dict:
+    """一次跑完整条流水线，返回 merge 统计；tsv 为 True 或路径时顺带导出 TSV"""
+    rows = generate(iter_catalog(list_dir))
+    if tsv:
+        rows = tee_tsv(rows, TSV if tsv is True else tsv)
+    seed = load_seed(seed_path)
+    stats = merge_into_seed(seed, rows)
+    save_seed(seed, seed_path)
+    write_pack(seed, pack_path)
+    write_search_db(seed, search_path)
+    return stats
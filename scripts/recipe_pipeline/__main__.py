@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+"""PYTHONPATH=scripts python -m recipe_pipeline [--tsv [PATH]]"""
+import sys, argparse
+
+from . import build, SEED
+
+def main():
+    ap = argparse.ArgumentParser(prog="recipe_pipeline",
+                                 description="lists -> instructions -> seed_more.json -> seed_pack.json in one process")
+    ap.add_argument("--tsv", nargs="?", const=True, default=False, metavar="PATH",
+                    help="also export instructions.tsv (optionally to PATH)")
+    args = ap.parse_args()
+    stats = build(tsv=args.tsv)
+    print(f"done. updated={stats['updated']}, added={stats['added']}, "
+          f"unchanged={stats['unchanged']} -> {SEED}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
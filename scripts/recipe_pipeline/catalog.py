@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+catalog 阶段：读取 assets/recipes/lists/ 下的八大菜系 *.txt（每行一个菜名，# 开头为注释），
+产出 (菜名, 中文菜系)。同一文件内重复的菜名只保留第一次出现。
+load_names() 汇总全部菜名（抓图、图片解析等脚本共用）。
+"""
+import json
+from pathlib import Path
+from typing import Iterator
+
+from .paths import LIST_DIR, NAMES, SEED
+
+# 清单文件 -> 中文菜系（做法模板按中文菜系取默认版）
+CUISINE_BY_FILE = {
+    "chuancai.txt": "川菜",
+    "yuecai.txt": "粤菜",
+    "sucai.txt":  "苏菜",
+    "zhecai.txt": "浙菜",
+    "mincai.txt": "闽菜",
+    "xiangcai.txt":"湘菜",
+    "huicai.txt": "徽菜",
+    "lucai.txt":  "鲁菜",
+}
+
+# 中文菜系/菜系 key -> seed 中使用的菜系 key
+CUISINE_MAP = {
+    "川菜":"chuancai","粤菜":"yuecai","苏菜":"sucai","浙菜":"zhecai",
+    "闽菜":"mincai","湘菜":"xiangcai","徽菜":"huicai","鲁菜":"lucai",
+    "自定义":"custom","custom":"custom","chuancai":"chuancai","yuecai":"yuecai",
+    "sucai":"sucai","zhecai":"zhecai","mincai":"mincai","xiangcai":"xiangcai",
+    "huicai":"huicai","lucai":"lucai",
+}
+
+# 菜系 key -> 中文菜系（八大菜系）
+CUISINE_ZH = {CUISINE_MAP[zh]: zh for zh in CUISINE_BY_FILE.values()}
+
+def cuisine_key(cuisine: str) -> str:
+    return CUISINE_MAP.get(cuisine, cuisine or "custom")
+
+def cuisine_zh(cuisine: str) -> str | None:
+    """中文菜系或 key -> 中文菜系；不是八大菜系之一时返回 None"""
+    return CUISINE_ZH.get(CUISINE_MAP.get(cuisine, ""))
+
+def read_list(path: Path) -> list:
+    path = Path(path)
+    if not path.exists():
+        return []
+    names, seen = [], set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            nm = line.strip()
+            if nm and not nm.startswith("#") and nm not in seen:
+                seen.add(nm)
+                names.append(nm)
+    return names
+
+def load_names(names_file: Path = NAMES, seed_path: Path = SEED, list_dir: Path = LIST_DIR) -> set:
+    """seed_names.txt + seed_more.json + lists/*.txt（含不在 CUISINE_BY_FILE 里的清单）中的全部菜名"""
+    names = set(read_list(names_file))
+    if Path(seed_path).exists():
+        try:
+            with open(seed_path, "r", encoding="utf-8") as f:
+                for item in json.load(f):
+                    nm = str(item.get("name", "")).strip()
+                    if nm:
+                        names.add(nm)
+        except Exception:
+            pass
+    if Path(list_dir).is_dir():
+        for path in sorted(Path(list_dir).glob("*.txt")):
+            names.update(read_list(path))
+    return names
+
+def iter_catalog(list_dir: Path = LIST_DIR) -> Iterator[tuple]:
+    """按 CUISINE_BY_FILE 的顺序产出 (菜名, 中文菜系)，同名同菜系去重"""
+    seen = set()
+    for fn, cui in CUISINE_BY_FILE.items():
+        for nm in read_list(Path(list_dir) / fn):
+            if (nm, cui) not in seen:
+                seen.add((nm, cui))
+                yield nm, cui
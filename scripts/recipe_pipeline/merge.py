@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+merge 阶段：把 (菜名, 菜系, 做法) 合并进内存中的 seed 列表（seed_more.json 的内容）。
+已有记录（同名同菜系）只更新 instructions，新菜名追加记录；空菜名或空做法跳过。
+merge_rows 逐行产出结果，调用方可据此只在真正有变化时写文件（见 watch_recipes.py）。
+"""
+import json
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .catalog import cuisine_key
+from .paths import SEED, atomic_write
+
+def load_seed(path: Path = SEED) -> list:
+    if not Path(path).exists():
+        print("seed_more.json not found, creating new one.")
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+            return data if isinstance(data, list) else []
+        except Exception:
+            return []
+
+def save_seed(seed: list, path: Path = SEED):
+    atomic_write(path, json.dumps(seed, ensure_ascii=False, indent=2))
+
+def merge_rows(seed: list, rows: Iterable[tuple]) -> Iterator[tuple]:
+    """逐行合并，产出 ("updated" | "added" | "unchanged", 记录)；seed 原地修改"""
+    by_key = {(it.get("name", ""), it.get("cuisine", "")): it for it in seed}
+    for name, cuisine, instr in rows:
+        name, instr = name.strip(), instr.strip()
+        if not name or not instr:
+            continue
+        key = (name, cuisine_key(cuisine))
+        obj = by_key.get(key)
+        if obj is not None:
+            if obj.get("instructions") == instr:
+                yield "unchanged", obj
+                continue
+            obj["instructions"] = instr
+            yield "updated", obj
+        else:
+            obj = {"name": name, "cuisine": key[1], "instructions": instr}
+            seed.append(obj)
+            by_key[key] = obj
+            yield "added", obj
+
+def merge_into_seed(seed: list, rows: Iterable[tuple]) -> dict:
+    """消费 rows 并返回 {"updated": n, "added": n, "unchanged": n}"""
+    stats = {"updated": 0, "added": 0, "unchanged": 0}
+    for kind, _ in merge_rows(seed, rows):
+        stats[kind] += 1
+    return stats
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+"""各阶段默认读写的路径（所有函数都接受路径参数，这里只是默认值），以及共用的原子写。"""
+import os
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+REC_DIR = ROOT / "assets" / "recipes"
+LIST_DIR = REC_DIR / "lists"
+TSV = REC_DIR / "instructions" / "instructions.tsv"
+SEED = REC_DIR / "seed_more.json"
+NAMES = REC_DIR / "seed_names.txt"
+PACK = REC_DIR / "seed_pack.json"
+
+def atomic_write(path, text: str):
+    """先写同目录临时文件再 os.replace：App 打包或监听模式读到的永远是完整文件"""
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
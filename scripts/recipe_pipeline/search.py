@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+search 阶段：把 seed 记录（name / cuisine / instructions）建成独立的 SQLite FTS4 全文检索库
+assets/recipes/search.db，App 按“豆瓣”“清蒸”“花椒”这类技法/食材词查菜，不必逐条扫描做法全文。
+用 FTS4 而不是 FTS5：App 经 sqflite 用的是 Android 系统自带的 SQLite，只编译了 FTS3/FTS4。
+
+分词：SQLite 自带分词器不切中文，这里在写入前预分词为“字二元组”（bigram），用空格连接：
+  "豆瓣酱炒香" -> "豆瓣 瓣酱 酱炒 炒香 香"；末字另记一个单字，英文/数字按词、转小写。
+查询用同样的切法，多字词变成 bigram 短语（"豆瓣酱" -> "豆瓣 瓣酱" 须相邻）；
+单字用前缀匹配（鱼* 命中以它开头的 bigram 或段末单字，因此任何位置的字都能查到）；多个词以空格相连（AND）。
+
+表结构：
+  recipes(id INTEGER PRIMARY KEY, name, cuisine)     -- id 与 recipe_fts 的 rowid 一致
+  recipe_fts USING fts4(name, cuisine, instructions, content="")
+      无内容表（contentless）：只存倒排索引，不存原文，体积最小；原文在 App 的主库里。
+排序：FTS4 没有内置 bm25，查询取 matchinfo(recipe_fts, 'pcnalx') 按 BM25 打分（bm25()，
+RANK_WEIGHTS 加权，菜名命中权重最高）；Dart 端 RecipeSearch 用同一公式。
+写完后 'optimize' 把所有段合并为一棵 b-tree，再 VACUUM 去掉空闲页；
+PRAGMA user_version 记内容指纹（sha1 前 31 位），App 据此判断拷出的副本是否过期。
+"""
+import os, re, math, time, random, struct, sqlite3, hashlib, tempfile
+from pathlib import Path
+from typing import Iterable
+
+from .catalog import CUISINE_ZH
+from .paths import REC_DIR
+
+SEARCH_DB = REC_DIR / "search.db"
+RANK_WEIGHTS = (10.0, 2.0, 1.0)  # name, cuisine, instructions
+BM25_K1, BM25_B = 1.2, 0.75
+
+_CJK = "\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"  # CJK 扩展 A、基本区、兼容区
+_RUN_RE = re.compile(rf"[{_CJK}]+|[A-Za-z0-9]+")
+_IS_CJK = re.compile(rf"[{_CJK}]")
+
+def _bigrams(run: str) -> list:
+    return [run[i:i + 2] for i in range(len(run) - 1)]
+
+def tokens(text: str) -> list:
+    """中文连续段切 bigram 并追加段末单字，英文/数字按词"""
+    out = []
+    for run in _RUN_RE.findall(text or ""):
+        if not _IS_CJK.match(run):
+            out.append(run.lower())
+        else:
+            out.extend(_bigrams(run))
+            out.append(run[-1])
+    return out
+
+def match_expr(query: str) -> str:
+    """用户输入 -> FTS4 MATCH 表达式；空格分隔的多个词为 AND（隐式，标准/增强查询语法通用）"""
+    parts = []
+    for run in _RUN_RE.findall(query or ""):
+        if not _IS_CJK.match(run):
+            parts.append(f'"{run.lower()}"')
+        elif len(run) == 1:
+            parts.append(f"{run}*")
+        else:
+            parts.append('"' + " ".join(_bigrams(run)) + '"')
+    return " ".join(parts)
+
+def _create(conn: sqlite3.Connection):
+    conn.executescript("""
+        PRAGMA page_size = 4096;
+        CREATE TABLE recipes(id INTEGER PRIMARY KEY, name TEXT NOT NULL, cuisine TEXT NOT NULL);
+        CREATE VIRTUAL TABLE recipe_fts USING fts4(name, cuisine, instructions, content="");
+    """)
+
+def _rows(entries: Iterable[dict]):
+    for i, e in enumerate(entries, 1):
+        name, cuisine = str(e.get("name", "")), str(e.get("cuisine", ""))
+        yield (i, name, cuisine,
+               " ".join(tokens(name)),
+               " ".join(tokens(f"{cuisine} {CUISINE_ZH.get(cuisine, '')}")),
+               " ".join(tokens(e.get("instructions") or "")))
+
+def write_search_db(entries: Iterable[dict], path: Path = SEARCH_DB, quiet: bool = False) -> int:
+    """重建检索库（先写临时文件再替换），返回记录数"""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    if tmp.exists():
+        tmp.unlink()
+    t0 = time.perf_counter()
+    conn = sqlite3.connect(tmp)
+    try:
+        _create(conn)
+        n = 0
+        digest = hashlib.sha1()
+        with conn:
+            for row in _rows(entries):
+                rid, name, cuisine, t_name, t_cui, t_instr = row
+                digest.update("\t".join(map(str, row)).encode("utf-8") + b"\n")
+                conn.execute("INSERT INTO recipes(id, name, cuisine) VALUES(?, ?, ?)", (rid, name, cuisine))
+                conn.execute("INSERT INTO recipe_fts(rowid, name, cuisine, instructions) VALUES(?, ?, ?, ?)",
+                             (rid, t_name, t_cui, t_instr))
+                n += 1
+            conn.execute("INSERT INTO recipe_fts(recipe_fts) VALUES('optimize')")
+        conn.execute(f"PRAGMA user_version = {int(digest.hexdigest()[:8], 16) & 0x7FFFFFFF}")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    os.replace(tmp, path)
+    if not quiet:
+        print(f"[search] {n} recipes -> {path} ({path.stat().st_size} bytes, "
+              f"{(time.perf_counter() - t0) * 1000:.0f} ms)")
+    return n
+
+def bm25(matchinfo: bytes, weights=RANK_WEIGHTS) -> float:
+    """matchinfo 'pcnalx' -> BM25 分数（越大越相关）；各短语、各列按权重累加"""
+    mi = struct.unpack(f"={len(matchinfo) // 4}I", matchinfo)
+    p, c, n = mi[0], mi[1], mi[2]
+    avgdl, dl, x = mi[3:3 + c], mi[3 + c:3 + 2 * c], 3 + 2 * c
+    score = 0.0
+    for i in range(p):
+        for j in range(c):
+            hits, _, docs = mi[x + 3 * (i * c + j):x + 3 * (i * c + j) + 3]
+            if not hits or not weights[j]:
+                continue
+            idf = max(math.log((n - docs + 0.5) / (docs + 0.5)), 1e-6)
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * dl[j] / max(avgdl[j], 1))
+            score += weights[j] * idf * hits * (BM25_K1 + 1) / (hits + norm)
+    return score
+
+def search(conn: sqlite3.Connection, query: str, limit: int = 20) -> list:
+    """返回 [(id, name, cuisine, rank)]，rank 为负的 BM25 分数，越小越相关"""
+    expr = match_expr(query)
+    if not expr:
+        return []
+    scored = sorted((-bm25(mi), rid) for rid, mi in conn.execute(
+        "SELECT rowid, matchinfo(recipe_fts, 'pcnalx') FROM recipe_fts WHERE recipe_fts MATCH ?", (expr,)))
+    out = []
+    for rank, rid in scored[:limit]:
+        name, cuisine = conn.execute("SELECT name, cuisine FROM recipes WHERE id = ?", (rid,)).fetchone()
+        out.append((rid, name, cuisine, rank))
+    return out
+
+# ------------------------- 基准测试 -------------------------
+BENCH_QUERIES = ["豆瓣", "清蒸", "花椒", "宫保鸡丁", "红烧 五花肉", "糖醋汁", "蒸", "川菜 豆腐"]
+
+def synthetic_entries(entries: list, n: int, seed: int = 0) -> list:
+    """用真实记录拼出 n 条合成菜谱：菜名前缀/做法随机组合，词频分布接近真实数据"""
+    rng = random.Random(seed)
+    prefixes = ["家常", "秘制", "老式", "农家", "香辣", "清炖", "小炒", "干煸", "酱香", "蒜蓉"]
+    out = []
+    for i in range(n):
+        a, b = rng.choice(entries), rng.choice(entries)
+        out.append({"name": f"{rng.choice(prefixes)}{a.get('name', '')}{i}",
+                    "cuisine": a.get("cuisine", ""),
+                    "instructions": (b.get("instructions") or "") + "\n" + (a.get("instructions") or "")[:60]})
+    return out
+
+def bench(entries: list, n: int = 100_000, path: Path | None = None, repeat: int = 50) -> dict:
+    """建 n 条合成菜谱的检索库并测各查询延迟（毫秒，p50/p95），结果打印并返回"""
+    path = Path(path or os.path.join(tempfile.gettempdir(), f"search.bench-{n}.db"))
+    docs = synthetic_entries(entries, n)
+    t0 = time.perf_counter()
+    write_search_db(docs, path, quiet=True)
+    build_s = time.perf_counter() - t0
+    size = path.stat().st_size
+    print(f"[bench] {n} recipes: build {build_s:.1f}s, {size / 1024 / 1024:.1f} MiB "
+          f"({size / n:.0f} bytes/recipe)")
+
+    result = {"recipes": n, "build_s": build_s, "bytes": size, "queries": {}}
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        for q in BENCH_QUERIES:
+            hits = len(search(conn, q, limit=20))
+            total = conn.execute("SELECT count(*) FROM recipe_fts WHERE recipe_fts MATCH ?",
+                                 (match_expr(q),)).fetchone()[0]
+            lat = []
+            for _ in range(repeat):
+                t = time.perf_counter()
+                search(conn, q, limit=20)
+                lat.append((time.perf_counter() - t) * 1000)
+            lat.sort()
+            p50, p95 = lat[len(lat) // 2], lat[int(len(lat) * 0.95) - 1]
+            result["queries"][q] = {"matches": total, "p50_ms": p50, "p95_ms": p95}
+            print(f"  {q:<10} matches={total:<7} top={hits:<3} p50={p50:6.2f} ms  p95={p95:6.2f} ms")
+    finally:
+        conn.close()
+        path.unlink()
+    return result
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+seed 阶段：seed_more.json（可编辑、可读的源数据）与 App 实际打包的 seed_pack.json（做法去重版）。
+
+default_entries() 从清单生成只有默认做法的记录（build_seed_json.py 用），字段：
+  name, cuisine, image_url(空；已有的预解析图片字段会保留), instructions(默认), ingredients([])
+
+seed_pack.json 结构：
+  {"version": 1,
+   "instructions": ["1) ...{0}...", ...],          # 去重后的做法正文，{0} 为参数占位
+   "recipes": [{"name", "cuisine", "image_url", "ingredients",
+                "instructions_id": 0, "instructions_arg": "鸡丁"}, ...]}
+  做法 = instructions[instructions_id].replace("{0}", instructions_arg)（无 arg 时原样）。
+  仅菜名（或菜名后缀，即模板里的主料）不同的做法会共用一条正文。
+"""
+import json
+from pathlib import Path
+from typing import Iterator
+
+from .catalog import CUISINE_BY_FILE, CUISINE_MAP, read_list
+from .paths import LIST_DIR, PACK, SEED, atomic_write
+
+ARG = "{0}"  # 做法正文中的参数占位
+
+def default_steps(name: str) -> str:
+    return (
+        "1) 准备好食材并完成基础处理；\n"
+        "2) 热锅冷油依次下主辅料；\n"
+        "3) 调味后根据口感收汁或焖煮；\n"
+        f"4) 出锅装盘，即成《{name}》。"
+    )
+
+def _param_candidates(name: str, text: str) -> list:
+    """可作为参数的子串：菜名本身及其后缀（模板按“前缀+主料”生成，主料即后缀）"""
+    if ARG in text:
+        return []
+    return [name[i:] for i in range(len(name)) if name[i:] in text]
+
+def intern_instructions(entries: list) -> dict:
+    """把 entries（seed_more.json 的记录）转成做法去重的 pack 结构"""
+    # 先统计每个候选正文能被多少条记录共用，再为每条记录选共用最多的那种拆法
+    counts: dict[str, int] = {}
+    for e in entries:
+        text = e.get("instructions") or ""
+        for body in {text.replace(p, ARG) for p in _param_candidates(e.get("name", ""), text)}:
+            counts[body] = counts.get(body, 0) + 1
+
+    bodies, ids, recipes = [], {}, []
+    for e in entries:
+        text = e.get("instructions") or ""
+        best, best_arg = text, None
+        for p in _param_candidates(e.get("name", ""), text):
+            body = text.replace(p, ARG)
+            # 共用条数多者优先；同样多时取更长的参数（更具体）
+            if counts[body] > 1 and (best_arg is None or counts[body] > counts[best]
+                                     or (counts[body] == counts[best] and len(p) > len(best_arg))):
+                best, best_arg = body, p
+        if best not in ids:
+            ids[best] = len(bodies)
+            bodies.append(best)
+        r = {k: v for k, v in e.items() if k != "instructions"}
+        r["instructions_id"] = ids[best]
+        if best_arg is not None:
+            r["instructions_arg"] = best_arg
+        recipes.append(r)
+    return {"version": 1, "instructions": bodies, "recipes": recipes}
+
+def expand_instructions(pack: dict, r: dict) -> str:
+    body = pack["instructions"][r["instructions_id"]]
+    arg = r.get("instructions_arg")
+    return body.replace(ARG, arg) if arg is not None else body
+
+def write_pack(entries: list, path: Path = PACK):
+    """写 seed_pack.json，并报告相对逐条存储节省的字节（asset 与设备端数据库）"""
+    pack = intern_instructions(entries)
+    for e, r in zip(entries, pack["recipes"]):
+        # 不用 assert：python -O 会去掉它，坏包就会被写出去
+        if expand_instructions(pack, r) != (e.get("instructions") or ""):
+            raise ValueError(f"seed_pack round-trip mismatch: {e.get('name')}")
+    compact = dict(separators=(",", ":"), ensure_ascii=False)
+    data = json.dumps(pack, **compact)
+    atomic_write(path, data)
+
+    flat = len(json.dumps(entries, **compact).encode("utf-8"))
+    packed = len(data.encode("utf-8"))
+    # 设备端：recipes.instructions 逐条存全文 vs 共享表（正文一份 + 每行 id/参数）
+    db_flat = sum(len((e.get("instructions") or "").encode("utf-8")) for e in entries)
+    db_interned = sum(len(b.encode("utf-8")) for b in pack["instructions"]) + sum(
+        4 + len((r.get("instructions_arg") or "").encode("utf-8")) for r in pack["recipes"])
+    print(f"[pack] {len(entries)} recipes -> {len(pack['instructions'])} instruction bodies, write {path}")
+    print(f"  asset    : {flat} -> {packed} bytes (saved {flat - packed}, {(flat - packed) / flat * 100 if flat else 0:.1f}%)")
+    print(f"  database : instructions column {db_flat} -> {db_interned} bytes if interned "
+          f"(saved {db_flat - db_interned}, {(db_flat - db_interned) / db_flat * 100 if db_flat else 0:.1f}%)")
+    return pack
+
+IMAGE_FIELDS = ("image_url", "image_source", "image_resolved_at")  # 由 prefetch_image_urls.py 写入
+
+def load_image_fields(path: Path = SEED) -> dict:
+    """现有 seed_more.json 中已预解析的图片字段，重建时不丢失"""
+    if not Path(path).exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    return {(e.get("name"), e.get("cuisine")): {k: e[k] for k in IMAGE_FIELDS if e.get(k)}
+            for e in old if isinstance(e, dict) and e.get("image_url")}
+
+def default_entries(list_dir: Path = LIST_DIR, images: dict | None = None) -> Iterator[dict]:
+    """按文件名顺序读清单，产出默认记录（按 name+cuisine 去重）；images 为 load_image_fields() 的结果"""
+    seen = set()
+    for txt in sorted(Path(list_dir).glob("*.txt")):
+        cuisine = CUISINE_MAP.get(CUISINE_BY_FILE.get(txt.name, ""))
+        if not cuisine:
+            print(f"[skip] {txt.name} 未在映射表中")
+            continue
+        names = read_list(txt)
+        for name in names:
+            if (name, cuisine) in seen:
+                continue
+            seen.add((name, cuisine))
+            e = {
+                "name": name,
+                "cuisine": cuisine,
+                "image_url": "",
+                "instructions": default_steps(name),
+                "ingredients": []
+            }
+            e.update((images or {}).get((name, cuisine), {}))
+            yield e
+        print(f"[ok] {txt.name}: {len(names)} items")
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+instructions.tsv 的随机访问：旁路索引 + mmap 读取，查一道菜不必把整个 TSV 过一遍 csv.DictReader。
+
+索引文件默认与 TSV 同目录：instructions.tsv.idx（先写临时文件再替换），三段：
+  1) 一行 JSON 头：{"version": 1, "size": TSV 字节数, "mtime_ns": TSV 修改时间, "rows": 行数}
+  2) rows 个 uint64（小端）：每个数据行的起始字节偏移
+  3) UTF-8 文本，每行 "菜名\t菜系 key"
+不用整份 JSON：百万行时 json.load 要几秒，而这里载入只是两次整块解码（百万行约 1 秒，逐行解析整个 TSV 要 5 秒以上）。
+size 与 mtime_ns 任一对不上（TSV 被 tee_tsv/watch_recipes 整体重写过）就一遍扫描重建。
+
+  - get(菜名, 菜系)：字典查到行号 -> 偏移，mmap 上直接切出这一行；菜系写中文或 key 都可以；
+  - rows(start, stop)：按物理行号范围顺序读，一次定位到 start；
+  - append(rows)：在文件末尾追加行并增量更新索引，不重写文件。
+    改某道菜的做法也是追加一行：同名同菜系以最后一行为准，与 read_tsv + merge_rows 的结果一致。
+行格式与 tee_tsv 相同（instructions.tsv_line：name\tcuisine\tinstructions，做法里的换行写作 \\n），
+解析用与 read_tsv 相同的 csv 方言（TSV_DIALECT，不认引号），两边读出的内容一致。
+"""
+import os, sys, csv, json, mmap
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .catalog import cuisine_key
+from .instructions import TSV_DIALECT, TSV_HEADER, tsv_line, unesc
+from .paths import TSV
+
+INDEX_VERSION = 1
+HEADER = TSV_HEADER.encode("utf-8")
+
+def index_path_for(path: Path) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + ".idx")
+
+def _key(name: str, cuisine: str) -> str:
+    return f"{name}\t{cuisine_key(cuisine)}"
+
+def _parse(line: bytes) -> tuple:
+    parts = next(csv.reader([line.rstrip(b"\r\n").decode("utf-8")], **TSV_DIALECT), [])
+    parts += [""] * (3 - len(parts))
+    return parts[0].strip(), parts[1].strip(), unesc(parts[2])
+
+class TsvIndex:
+    """with TsvIndex() as idx: idx.get("宫保鸡丁", "川菜")"""
+
+    def __init__(self, path: Path = TSV, index_path: Path | None = None):
+        self.path = Path(path)
+        self.index_path = Path(index_path) if index_path else index_path_for(self.path)
+        self.offsets = array("Q")
+        self.keys: list = []        # "菜名\t菜系 key"，与 offsets 一一对应
+        self.by_key: dict = {}      # 同上 -> 行号；重复键以最后一行为准
+        self._mm = None
+        self._f = None
+        if not self._load():
+            self.rebuild()
+        self._map()
+
+    # ---------------- 索引 ----------------
+    def _stat(self) -> tuple:
+        st = self.path.stat()
+        return st.st_size, st.st_mtime_ns
+
+    def _load(self) -> bool:
+        """索引存在且与 TSV 的 size/mtime 一致时载入"""
+        if not self.path.exists() or not self.index_path.exists():
+            return False
+        try:
+            with open(self.index_path, "rb") as f:
+                head = json.loads(f.readline())
+                if (head.get("version") != INDEX_VERSION
+                        or [head.get("size"), head.get("mtime_ns")] != list(self._stat())):
+                    return False
+                offsets = array("Q")
+                offsets.frombytes(f.read(head["rows"] * offsets.itemsize))
+                if sys.byteorder != "little":
+                    offsets.byteswap()
+                keys = f.read().decode("utf-8").split("\n")[:head["rows"]]
+        except Exception:
+            return False
+        if len(offsets) != len(keys):
+            return False
+        self.offsets, self.keys = offsets, keys
+        self.by_key = dict(zip(keys, range(len(keys))))
+        return True
+
+    def _save(self):
+        size, mtime_ns = self._stat()
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        offsets = self.offsets
+        if sys.byteorder != "little":
+            offsets = array("Q", offsets)
+            offsets.byteswap()
+        with open(tmp, "wb") as f:
+            f.write(json.dumps({"version": INDEX_VERSION, "size": size, "mtime_ns": mtime_ns,
+                                "rows": len(self.offsets)}).encode("utf-8") + b"\n")
+            f.write(offsets.tobytes())
+            f.write("\n".join(self.keys).encode("utf-8"))
+        os.replace(tmp, self.index_path)
+
+    def rebuild(self) -> int:
+        """一遍扫描 TSV 重建索引，返回数据行数"""
+        self.offsets, self.keys, self.by_key = array("Q"), [], {}
+        if self.path.exists() and self.path.stat().st_size:
+            with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pos = mm.find(b"\n") + 1 if mm[:len(HEADER)] == HEADER else 0
+                size = len(mm)
+                while pos < size:
+                    end = mm.find(b"\n", pos)
+                    end = size if end < 0 else end + 1
+                    head = mm[pos:end].split(b"\t", 2)
+                    if len(head) == 3:
+                        self._add(head[0].decode("utf-8").strip(), head[1].decode("utf-8").strip(), pos)
+                    pos = end
+        if self.path.exists():
+            self._save()
+        return len(self.offsets)
+
+    def _add(self, name: str, cuisine: str, offset: int):
+        key = _key(name, cuisine)
+        self.by_key[key] = len(self.offsets)
+        self.offsets.append(offset)
+        self.keys.append(key)
+
+    # ---------------- 读取 ----------------
+    def _map(self):
+        self.close()
+        if self.path.exists() and self.path.stat().st_size:
+            self._f = open(self.path, "rb")
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._f.close()
+            self._mm = self._f = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __contains__(self, key) -> bool:
+        return _key(*key) in self.by_key
+
+    def _line(self, i: int) -> bytes:
+        start = self.offsets[i]
+        end = self.offsets[i + 1] if i + 1 < len(self.offsets) else len(self._mm)
+        return self._mm[start:end]
+
+    def row(self, i: int) -> tuple:
+        """第 i 个数据行（从 0 起） -> (菜名, 菜系, 做法)"""
+        return _parse(self._line(i))
+
+    def get(self, name: str, cuisine: str) -> str | None:
+        i = self.by_key.get(_key(name, cuisine))
+        return None if i is None else self.row(i)[2]
+
+    def rows(self, start: int = 0, stop: int | None = None) -> Iterator[tuple]:
+        """物理行 [start, stop) 依次产出 (菜名, 菜系, 做法)；被后面追加行覆盖的旧行也会出现"""
+        stop = len(self.offsets) if stop is None else min(stop, len(self.offsets))
+        if start >= stop:
+            return
+        end = self.offsets[stop] if stop < len(self.offsets) else len(self._mm)
+        for line in self._mm[self.offsets[start]:end].splitlines(keepends=True):
+            yield _parse(line)
+
+    # ---------------- 追加 ----------------
+    def append(self, rows: Iterable[tuple]) -> int:
+        """(菜名, 菜系, 做法) 追加到 TSV 末尾并增量更新索引，返回追加行数"""
+        self.close()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        n = 0
+        with open(self.path, "ab") as f:
+            pos = f.tell()
+            if pos == 0:
+                f.write(HEADER)
+                pos = len(HEADER)
+            elif not self._ends_with_newline():
+                f.write(b"\n")
+                pos += 1
+            for nm, cui, instr in rows:
+                line = tsv_line(nm, cui, instr).encode("utf-8")
+                f.write(line)
+                self._add(nm.strip(), cui.strip(), pos)
+                pos += len(line)
+                n += 1
+        self._save()
+        self._map()
+        return n
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
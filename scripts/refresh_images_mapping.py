@@ -5,6 +5,8 @@
 """
 import os, json, re
 
+from build_image_meta import entry_path
+
 ROOT = os.path.dirname(os.path.dirname(__file__))
 MAP = os.path.join(ROOT, "assets", "recipes", "images.json")
 IMG_DIR = os.path.join(ROOT, "assets", "images")
@@ -18,14 +20,19 @@ def main():
 
     changed = False
     for k, v in list(data.items()):
-        if not isinstance(v, str):
+        path = entry_path(v)
+        if not path:
             continue
-        base, ext = os.path.splitext(v)
+        base, ext = os.path.splitext(path)
         if ext.lower() in [".jpg", ".jpeg", ".png"]:
             webp = base + ".webp"
             # 确认 webp 真实存在
             if os.path.exists(os.path.join(ROOT, webp)):
-                data[k] = webp
+                if isinstance(v, dict):
+                    # 图片已换，旧的占位信息作废
+                    data[k] = {"path": webp}
+                else:
+                    data[k] = webp
                 changed = True
 
     if changed:
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+监听模式：常驻内存，编辑即增量重建
+  - 监听 assets/recipes/lists/*.txt 与 scripts/recipe_pipeline/instructions.py
+    （SPECIAL_RECIPES / STYLE_TEMPLATES / DEFAULT_BY_CUISINE 都在后者里）；
+  - 内存中保留解析好的菜名清单、生成的做法、seed_more.json；
+  - 某个清单变化时只重新解析该文件，只为新增菜名生成做法；
+    模板脚本变化时 reload 后逐行比对，只更新做法有变化的行；
+  - 有变化才写 seed_more.json（及派生的 seed_pack.json、search.db），加 --tsv 时同时维护
+    instructions.tsv；都先写临时文件再 os.replace（原子替换）。
+
+合并语义见 recipe_pipeline/merge.py：已有记录只更新 instructions，新菜名追加记录；
+从清单删除的菜名只从内存（及 TSV）移除，seed 中的记录保留。
+
+用法：
+  python scripts/watch_recipes.py              # 常驻，默认每 0.2 秒轮询一次
+  python scripts/watch_recipes.py --once       # 全量对齐一次后退出
+  python scripts/watch_recipes.py --tsv        # 同时导出 instructions.tsv
+"""
+import os, sys, json, time, argparse, importlib, traceback
+
+from recipe_pipeline import catalog, merge
+from recipe_pipeline import instructions as gen
+from recipe_pipeline.paths import LIST_DIR, SEED, TSV, atomic_write
+from recipe_pipeline.seed import write_pack
+from recipe_pipeline.search import write_search_db
+
+GEN_SRC = os.path.abspath(gen.__file__)
+
+def mtime(path) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+class Watcher:
+    def __init__(self, tsv: bool = False):
+        self.tsv = tsv
+        self.lists = {}   # 文件名 -> [菜名]（文件内已去重）
+        self.instr = {}   # (菜名, 中文菜系) -> 做法
+        self.seed = merge.load_seed()
+        self.stamps = {}  # 路径 -> mtime_ns
+        self.seed_stamp = mtime(SEED)
+        for fn in catalog.CUISINE_BY_FILE:
+            self.lists[fn] = catalog.read_list(LIST_DIR / fn)
+            self.stamps[str(LIST_DIR / fn)] = mtime(LIST_DIR / fn)
+        self.stamps[GEN_SRC] = mtime(GEN_SRC)
+        self.regenerate(self.items())
+
+    def items(self) -> list:
+        """与 catalog.iter_catalog 相同的顺序与去重规则"""
+        out = []
+        for fn, cui in catalog.CUISINE_BY_FILE.items():
+            out.extend((nm, cui) for nm in self.lists.get(fn, []))
+        return out
+
+    def regenerate(self, keys) -> set:
+        """为给定 (菜名, 菜系) 重新生成做法，返回做法有变化的 key"""
+        changed = set()
+        for key in keys:
+            text = gen.gen_by_style(*key)
+            if self.instr.get(key) != text:
+                self.instr[key] = text
+                changed.add(key)
+        return changed
+
+    def apply_to_seed(self, keys) -> int:
+        rows = ((nm, cui, self.instr[(nm, cui)]) for nm, cui in keys)
+        return sum(1 for kind, _ in merge.merge_rows(self.seed, rows) if kind != "unchanged")
+
+    def tsv_text(self) -> str:
+        rows = [gen.TSV_HEADER]
+        for nm, cui in self.items():
+            rows.append(gen.tsv_line(nm, cui, self.instr[(nm, cui)]))
+        return "".join(rows)
+
+    def write_outputs(self, tsv: bool, seed: bool):
+        if tsv and self.tsv:
+            TSV.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(str(TSV), self.tsv_text())
+        if seed:
+            atomic_write(str(SEED), json.dumps(self.seed, ensure_ascii=False, indent=2))
+            self.seed_stamp = mtime(SEED)
+            write_pack(self.seed)
+            write_search_db(self.seed)
+
+    def sync_all(self):
+        """全量对齐：TSV 与 seed 都按当前内存状态写出（仅在内容不同时写）"""
+        tsv_old = None
+        if self.tsv and TSV.exists():
+            with open(TSV, "r", encoding="utf-8") as f:
+                tsv_old = f.read()
+        tsv_changed = self.tsv and self.tsv_text() != tsv_old
+        seed_changed = self.apply_to_seed(self.items())
+        self.write_outputs(tsv=tsv_changed, seed=bool(seed_changed))
+        print(f"[sync] rows={len(self.items())} tsv_changed={tsv_changed} seed_changed={seed_changed}")
+
+    def poll(self):
+        t0 = time.perf_counter()
+        affected, rows_changed = set(), False
+        # 外部改写了 seed（例如 git pull / 其它脚本），重新载入
+        if mtime(SEED) != self.seed_stamp:
+            self.seed = merge.load_seed()
+            self.seed_stamp = mtime(SEED)
+            affected |= set(self.items())
+            print("[seed] reloaded external change")
+
+        for fn, cui in catalog.CUISINE_BY_FILE.items():
+            path = str(LIST_DIR / fn)
+            m = mtime(path)
+            if m == self.stamps.get(path):
+                continue
+            self.stamps[path] = m
+            before, after = self.lists.get(fn, []), catalog.read_list(LIST_DIR / fn)
+            if before == after:
+                continue
+            self.lists[fn] = after
+            keep = set(after)
+            removed = [(nm, cui) for nm in before if nm not in keep]
+            for key in removed:
+                self.instr.pop(key, None)
+            added = [(nm, cui) for nm in after if (nm, cui) not in self.instr]
+            affected |= self.regenerate(added)
+            rows_changed = True
+            print(f"[list] {fn}: +{len(added)} -{len(removed)}")
+
+        m = mtime(GEN_SRC)
+        if m != self.stamps.get(GEN_SRC):
+            self.stamps[GEN_SRC] = m
+            try:
+                importlib.reload(gen)
+            except Exception:
+                # 编辑到一半的语法错误：保留上一次的模板，等下次保存
+                traceback.print_exc()
+                print("[templates] reload failed, keeping previous version")
+            else:
+                changed = self.regenerate(self.items())
+                affected |= changed
+                rows_changed |= bool(changed)
+                print(f"[templates] reloaded, {len(changed)} rows changed")
+
+        if not affected and not rows_changed:
+            return
+        seed_changed = self.apply_to_seed(affected)
+        self.write_outputs(tsv=rows_changed, seed=bool(seed_changed))
+        ms = (time.perf_counter() - t0) * 1000
+        print(f"[rebuild] rows={len(affected)} seed_records={seed_changed} in {ms:.1f} ms")
+
+def main():
+    ap = argparse.ArgumentParser(description="Watch recipe lists/templates and rebuild outputs incrementally.")
+    ap.add_argument("--interval", type=float, default=0.2, help="poll interval in seconds")
+    ap.add_argument("--once", action="store_true", help="sync outputs once and exit")
+    ap.add_argument("--tsv", action="store_true", help="also keep instructions.tsv in sync")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    w = Watcher(tsv=args.tsv)
+    w.sync_all()
+    print(f"[ready] {len(w.items())} dishes loaded in {(time.perf_counter() - t0) * 1000:.0f} ms")
+    if args.once:
+        return 0
+    print(f"[watch] {LIST_DIR}/*.txt, {GEN_SRC} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(args.interval)
+            w.poll()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())